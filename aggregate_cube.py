@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+聚合立方体模块 - (市场层级, 用户场景, 维度取值) 预聚合，筛选后的分组统计直接由单元格求和得到
+"""
+
+import numpy as np
+import pandas as pd
+
+# 各视图分组统计用到的维度
+CUBE_DIMENSIONS = [
+    'market_tier', 'granularity', 'user_scenario', 'user_intent', 'competition_quadrant',
+    'super_domain', 'target_user', 'biz_model', 'persona',
+]
+
+
+class AggregateCube:
+    """按 (层级, 场景, 维度取值) 保存行数与工具数之和
+
+    count/sum 可加，因此任意侧边栏筛选组合下的 count/sum/mean 都可以通过
+    对选中层级、场景的单元格求和得到，无需重新扫描原始行；数据变化时通过
+    `update` 减去旧行、加上新行的贡献即可增量维护。
+    """
+
+    def __init__(self, df, dimensions=None, measure='tools_count',
+                 tier_column='market_tier', scenario_column='user_scenario'):
+        self.measure = measure
+        self.tier_column = tier_column
+        self.scenario_column = scenario_column
+        self.sum_dtype = np.int64 if pd.api.types.is_integer_dtype(df[measure].dtype) else np.float64
+        _, self.tiers = _factorize(df[tier_column])
+        _, self.scenarios = _factorize(df[scenario_column])
+        # 筛选取值 → 坐标的普通字典，查询时不再对 CategoricalIndex 调用 get_indexer
+        self._tier_positions = _lookup(self.tiers)
+        self._scenario_positions = _lookup(self.scenarios)
+        self.dimensions = []
+        self.values, self.counts, self.sums = {}, {}, {}
+        for dim in (CUBE_DIMENSIONS if dimensions is None else dimensions):
+            self.add_dimension(df, dim)
+
+    def add_dimension(self, df, dim):
+        """为一个新维度建立 (层级, 场景, 取值) 单元格"""
+        codes, self.values[dim] = _factorize(df[dim])
+        shape = (len(self.tiers), len(self.scenarios), len(self.values[dim]))
+        self.counts[dim] = np.zeros(shape, dtype=np.int64)
+        self.sums[dim] = np.zeros(shape, dtype=self.sum_dtype)
+        self.dimensions.append(dim)
+        t = self.tiers.get_indexer(df[self.tier_column])
+        s = self.scenarios.get_indexer(df[self.scenario_column])
+        self._add(t, s, {dim: codes}, df[self.measure].to_numpy(), 1, [dim])
+
+    def stats(self, dimension, tiers=None, scenarios=None):
+        """筛选后按维度分组的 count/sum/mean (等价于 groupby(dimension, observed=True))"""
+        counts = self._slice(self.counts[dimension], tiers, scenarios)
+        sums = self._slice(self.sums[dimension], tiers, scenarios)
+        present = counts > 0
+        index = self.values[dimension][present]
+        counts, sums = counts[present], sums[present]
+        result = pd.DataFrame({'count': counts, 'sum': sums, 'mean': sums / counts}, index=index)
+        result.index.name = dimension
+        return result
+
+    def update(self, before, after):
+        """增量更新: before/after 为变化行更新前后的取值 (同列)"""
+        self._accumulate(before, -1)
+        self._accumulate(after, 1)
+
+    def _slice(self, cube, tiers, scenarios):
+        t = slice(None) if tiers is None else _positions(self._tier_positions, tiers)
+        s = slice(None) if scenarios is None else _positions(self._scenario_positions, scenarios)
+        return cube[t][:, s].sum(axis=(0, 1))
+
+    def _accumulate(self, df, sign):
+        if len(df) == 0:
+            return
+        self.tiers, t = self._encode(self.tiers, df[self.tier_column], axis=0)
+        self.scenarios, s = self._encode(self.scenarios, df[self.scenario_column], axis=1)
+        if len(self.tiers) != len(self._tier_positions):
+            self._tier_positions = _lookup(self.tiers)
+        if len(self.scenarios) != len(self._scenario_positions):
+            self._scenario_positions = _lookup(self.scenarios)
+        codes = {}
+        for dim in self.dimensions:
+            self.values[dim], codes[dim] = self._encode(self.values[dim], df[dim], axis=2, dim=dim)
+        self._add(t, s, codes, df[self.measure].to_numpy(), sign, self.dimensions)
+
+    def _add(self, t, s, codes, weights, sign, dimensions):
+        for dim in dimensions:
+            counts, sums = self.counts[dim], self.sums[dim]
+            flat = np.ravel_multi_index((t, s, codes[dim]), counts.shape)
+            counts += sign * np.bincount(flat, minlength=counts.size).reshape(counts.shape)
+            cell_sums = np.bincount(flat, weights=weights, minlength=sums.size).reshape(sums.shape)
+            sums += sign * cell_sums.astype(sums.dtype)
+
+    def _encode(self, index, values, axis, dim=None):
+        """取值 → 坐标；出现新取值时扩展索引与立方体"""
+        positions = index.get_indexer(values)
+        if (positions >= 0).all():
+            return index, positions
+        extra = pd.Index(pd.unique(np.asarray(values, dtype=object)[positions < 0]))
+        index = index.append(extra)
+        for d in ([dim] if dim is not None else self.dimensions):
+            for store in (self.counts, self.sums):
+                pad = [(0, 0)] * 3
+                pad[axis] = (0, len(extra))
+                store[d] = np.pad(store[d], pad)
+        return index, index.get_indexer(values)
+
+
+def _factorize(series):
+    """编码 + 取值索引，取值顺序与 groupby(sort=True) 一致"""
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, pd.Index(uniques)
+
+
+def _lookup(index):
+    """取值 → 坐标字典"""
+    return {value: position for position, value in enumerate(index)}
+
+
+def _positions(lookup, selected):
+    """选中取值的坐标 (忽略不存在的取值)"""
+    return np.array([lookup[value] for value in selected if value in lookup], dtype=np.intp)
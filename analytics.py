@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+分析计算模块 - 各分析视角的纯计算函数 (不依赖 Streamlit)，供仪表盘、批量报告与性能分析复用
+"""
+
+import pandas as pd
+
+# ============================================================================
+# 视图注册表
+# ============================================================================
+# 视图 ID → 侧边栏标题
+VIEW_LABELS = {
+    'summary': "🏠 执行摘要",
+    'market_structure': "🚀 市场结构视角",
+    'user_needs': "🧭 用户需求视角",
+    'trends': "🔎 趋势机会视角",
+    'product': "🪜 产品机会视角",
+    'taxonomy': "🧱 分类系统视角",
+    'business': "🧲 商业化视角",
+    'personas': "🧬 用户角色视角",
+}
+
+# 侧边栏筛选始终需要的维度
+FILTER_COLUMNS = ['market_tier', 'user_scenario']
+
+# 不受侧边栏筛选影响的视图
+GLOBAL_VIEWS = ['summary']
+
+# 各视图读取的分析维度 (维度按需惰性计算)
+VIEW_COLUMNS = {
+    'summary': [],
+    'market_structure': ['saturation_index', 'granularity'],
+    'user_needs': ['user_intent'],
+    'trends': ['llm_driven', 'pain_driven', 'competition_quadrant'],
+    'product': ['target_user'],
+    'taxonomy': ['granularity', 'super_domain'],
+    'business': ['target_user', 'biz_model'],
+    'personas': ['persona', 'user_intent'],
+}
+
+# 分类重叠组
+OVERLAP_GROUPS = {
+    '文本相关': ['Writing', 'Text', 'Content', 'Stories', 'Short stories', 'Copywriting'],
+    '教育相关': ['Education', 'Learning', 'Studying', 'School', 'School subject', 'Teaching'],
+    '图像相关': ['Images', 'Image editing', 'Anime image', 'Cartoon image', 'Photo editing', 'Portraits'],
+    '职业相关': ['Career', 'Job search', 'Resume', 'Job interview', 'Interview preparation'],
+    '健康相关': ['Health', 'Mental health', 'Fitness', 'Nutrition', 'Therapy', 'Meditation'],
+}
+
+# 分类冗余分析展示的重叠分类对数
+OVERLAP_PAIRS_TOP = 20
+
+WORK_PERSONAS = ['产品经理', '人力资源', '招聘专员', '数据分析师', '开发者',
+                 '管理者', '销售', '营销人员', '设计师', '法务', '财务', '教师', '研究员', '客服']
+
+INTEREST_PERSONAS = ['时尚爱好者', '美食爱好者', '品酒师', '宠物主人',
+                     '旅行者', '游戏玩家', '音乐爱好者', '艺术爱好者', '健身达人']
+
+TARGET_USER_TYPES = ['B2B企业', 'B2B/B2C', 'B2C个人']
+
+SATURATION_BINS = [0, 5, 15, 30, 50, 100]
+SATURATION_LABELS = ['蓝海空白', '蓝海机会', '竞争中等', '红海预警', '超级红海']
+
+# 列表展示列
+LIST_COLUMNS = ['category', 'chinese_name', 'tools_count', 'rank']
+
+# 原始数据列
+BASE_COLUMNS = ['rank', 'category', 'tools_count', 'chinese_name']
+
+
+def _filtered(processor, view, tiers, scenarios):
+    """确保视图所需维度已计算，返回筛选后的数据 (只保留视图读取的列，结果与其他列是否已计算无关)"""
+    columns = list(dict.fromkeys(BASE_COLUMNS + FILTER_COLUMNS + VIEW_COLUMNS[view]))
+    processor.get_data(columns)
+    return processor.filter(tiers=tiers, scenarios=scenarios)[columns]
+
+
+def _grouped(processor, dimension, tiers, scenarios, stats, names, sort_by=None):
+    """维度分组统计 (来自聚合立方体)，按 stats 取列、改名并可按某列降序"""
+    result = processor.dimension_stats(dimension, tiers, scenarios)[stats].round(0)
+    result.columns = names
+    if sort_by is not None:
+        result = result.sort_values(sort_by, ascending=False)
+    return result.reset_index()
+
+
+# ============================================================================
+# 各视图
+# ============================================================================
+def executive_summary(processor, tiers=None, scenarios=None):
+    """执行摘要 (全量数据，不受侧边栏筛选影响)"""
+    df = processor.get_data(FILTER_COLUMNS)
+    counts = df['tools_count']
+    total_tools = counts.sum()
+
+    # 工具数量占比: Top 5 + 其他
+    top5 = df.head(5).copy()
+    top5['market_share'] = (top5['tools_count'] / total_tools * 100).round(1)
+    others_count = counts.iloc[5:].sum()
+    others = pd.DataFrame({
+        'category': ['Others'],
+        'tools_count': [others_count],
+        'market_share': [(others_count / total_tools * 100).round(1)],
+    })
+
+    return {
+        'kpis': {
+            'categories': len(df),
+            'total_tools': total_tools,
+            'top10_share': processor.concentration().top_n_share(10),
+            'mean_tools': counts.mean(),
+            'median_tools': counts.median(),
+        },
+        'top15': df.head(15)[BASE_COLUMNS],
+        'share_pie': pd.concat([top5[['category', 'tools_count', 'market_share']], others]),
+    }
+
+
+def market_structure(processor, tiers=None, scenarios=None):
+    """市场结构: 供给饱和度、层级结构、集中度与颗粒度"""
+    df = _filtered(processor, 'market_structure', tiers, scenarios)
+
+    saturation = df.copy()
+    saturation['saturation_level'] = pd.cut(
+        saturation['saturation_index'], bins=SATURATION_BINS, labels=SATURATION_LABELS
+    )
+
+    tier_stats = processor.dimension_stats('market_tier', tiers, scenarios)[['count', 'sum', 'mean']].round(0)
+    tier_stats.columns = ['分类数量', '工具总数', '平均工具数']
+    tier_stats['工具占比%'] = (tier_stats['工具总数'] / tier_stats['工具总数'].sum() * 100).round(1)
+
+    # 头部集中度 (筛选后数据的前缀和)
+    curve = processor.concentration(tiers, scenarios)
+    concentration = pd.DataFrame([
+        {'Top N': f'Top {n}', '工具占比': f'{curve.top_n_share(n):.1f}%'} for n in [5, 10, 20, 50]
+    ])
+
+    return {
+        'rows': df,
+        'saturation_top50': saturation.head(50),
+        'super_red_ocean': df[df['saturation_index'] > 50][['category', 'tools_count', 'chinese_name']],
+        'blue_ocean_gap': df[df['saturation_index'] < 5].tail(15)[['category', 'tools_count', 'chinese_name']],
+        'tier_stats': tier_stats.reset_index(),
+        'concentration': concentration,
+        'pareto': pd.DataFrame({
+            'rank': range(1, len(curve) + 1),
+            'cumulative_share': curve.cumulative_share(),
+        }),
+        'pareto_80': curve.crossing_point(80),
+        'granularity_stats': _grouped(
+            processor, 'granularity', tiers, scenarios,
+            ['count', 'mean', 'sum'], ['分类数', '平均工具数', '工具总数'],
+        ),
+    }
+
+
+def user_needs(processor, tiers=None, scenarios=None):
+    """用户需求: 场景、意图与竞争强度"""
+    df = _filtered(processor, 'user_needs', tiers, scenarios)
+    names = ['分类数', '工具总数', '平均工具数']
+    return {
+        'rows': df,
+        'scenario_stats': _grouped(processor, 'user_scenario', tiers, scenarios,
+                                   ['count', 'sum', 'mean'], names, sort_by='工具总数'),
+        'intent_stats': _grouped(processor, 'user_intent', tiers, scenarios,
+                                 ['count', 'sum', 'mean'], names, sort_by='工具总数'),
+        'low_competition': processor.top_k(
+            15, 'tools_count', ascending=True, tiers=tiers, scenarios=scenarios
+        )[LIST_COLUMNS],
+        'high_competition': processor.top_k(
+            15, 'tools_count', ascending=False, tiers=tiers, scenarios=scenarios
+        )[LIST_COLUMNS],
+    }
+
+
+def trends(processor, tiers=None, scenarios=None):
+    """趋势机会: 大模型推动、痛点驱动与竞争格局"""
+    df = _filtered(processor, 'trends', tiers, scenarios)
+    llm = df[df['llm_driven']]
+    non_llm = df[~df['llm_driven']]
+    blue_ocean = df[df['competition_quadrant'] == '蓝海赛道 (工具数<100)']
+    return {
+        'llm_driven': llm[LIST_COLUMNS],
+        'llm_comparison': pd.DataFrame({
+            '类型': ['LLM推动', '传统赛道'],
+            '分类数': [len(llm), len(non_llm)],
+            '平均工具数': [llm['tools_count'].mean(), non_llm['tools_count'].mean()],
+            '工具总数': [llm['tools_count'].sum(), non_llm['tools_count'].sum()],
+        }),
+        'pain_driven': df[df['pain_driven']],
+        'quadrant_stats': _grouped(processor, 'competition_quadrant', tiers, scenarios,
+                                   ['count', 'sum', 'mean'], ['分类数', '工具总数', '平均工具数']),
+        'blue_ocean': blue_ocean[LIST_COLUMNS].head(10),
+    }
+
+
+def product_opportunities(processor, tiers=None, scenarios=None):
+    """产品机会: 高/低竞争赛道"""
+    df = _filtered(processor, 'product', tiers, scenarios)
+    return {
+        'high_supply': df[df['tools_count'] >= 500].sort_values('tools_count', ascending=False),
+        'low_supply': df[df['tools_count'] < 100].sort_values('tools_count', ascending=True),
+    }
+
+
+def taxonomy_insights(processor, tiers=None, scenarios=None):
+    """分类系统: 重叠组、颗粒度与超级领域
+
+    重叠组只按分类行统计工具总数；依赖成员关系的去重工具数与分类对见
+    taxonomy_overlap (只在对应标签页打开时计算)。
+    """
+    df = _filtered(processor, 'taxonomy', tiers, scenarios)
+
+    overlap = []
+    for group_name, categories in OVERLAP_GROUPS.items():
+        group = df[df['category'].isin(categories)]
+        overlap.append({
+            '重叠组': group_name,
+            '包含分类数': len(group),
+            '工具总数': group['tools_count'].sum(),
+            '包含分类': ', '.join(categories),
+        })
+    overlap = pd.DataFrame(overlap)
+
+    # 快照/紧凑模式下标签列为 Categorical，只统计实际出现的取值
+    granularity_count = df['granularity'].value_counts()
+    granularity_count = granularity_count[granularity_count > 0].reset_index()
+    granularity_count.columns = ['颗粒度', '分类数']
+    comparison = df.groupby('granularity', observed=True).agg({'tools_count': ['mean', 'min', 'max', 'count']}).round(0)
+    comparison.columns = ['平均工具数', '最少', '最多', '分类数']
+
+    return {
+        'rows': df,
+        'overlap': overlap,
+        'granularity_count': granularity_count,
+        'granularity_comparison': comparison,
+        'super_domain_stats': _grouped(processor, 'super_domain', tiers, scenarios,
+                                       ['count', 'sum', 'mean'], ['子分类数', '工具总数', '平均工具数'],
+                                       sort_by='工具总数'),
+    }
+
+
+def taxonomy_overlap(processor, overlap, tiers=None, scenarios=None):
+    """分类冗余: 重叠组表补充去重工具数，并给出共享工具最多的分类对
+
+    处理器带有工具→分类成员关系时返回 (补充后的重叠组表, 分类对)，否则
+    返回 (overlap, None)。计算量随成员关系规模增长，只在标签页打开时调用。
+    """
+    pairs = processor.category_overlap(tiers, scenarios, top_n=OVERLAP_PAIRS_TOP)
+    if pairs is None:
+        return overlap, None
+    distinct = processor.group_overlap(OVERLAP_GROUPS, tiers, scenarios)
+    overlap = overlap.copy()
+    overlap.insert(3, '去重工具数', distinct['distinct_tools'].to_numpy())
+    overlap.insert(4, '重复计数占比', distinct['duplicate_share'].round(3).to_numpy())
+    pairs = pairs.rename(columns={
+        'category_a': '分类A', 'category_b': '分类B', 'shared_tools': '共享工具数',
+        'tools_a': '分类A工具数', 'tools_b': '分类B工具数', 'jaccard': 'Jaccard',
+    }).round({'Jaccard': 3})
+    return overlap, pairs
+
+
+def business(processor, tiers=None, scenarios=None):
+    """商业化: 目标用户与商业模式"""
+    df = _filtered(processor, 'business', tiers, scenarios)
+    names = ['分类数', '工具总数', '平均工具数']
+    return {
+        'target_user_stats': _grouped(processor, 'target_user', tiers, scenarios,
+                                      ['count', 'sum', 'mean'], names, sort_by='工具总数'),
+        'target_user_examples': {
+            user_type: df[df['target_user'] == user_type]['category'].head(5).tolist()
+            for user_type in TARGET_USER_TYPES
+        },
+        'biz_model_stats': _grouped(processor, 'biz_model', tiers, scenarios,
+                                    ['count', 'sum', 'mean'], names, sort_by='工具总数'),
+    }
+
+
+def personas(processor, tiers=None, scenarios=None):
+    """用户角色: 工作、兴趣与情感/学习角色"""
+    df = _filtered(processor, 'personas', tiers, scenarios)
+
+    persona_stats = processor.dimension_stats('persona', tiers, scenarios)
+    persona_stats = persona_stats[persona_stats.index.isin(WORK_PERSONAS)][['sum', 'mean', 'count']].round(0)
+    persona_stats.columns = ['工具总数', '平均工具数', '相关分类数']
+
+    return {
+        'work_persona_stats': persona_stats.sort_values('工具总数', ascending=False).reset_index(),
+        'interest_rows': df[df['persona'].isin(INTEREST_PERSONAS)],
+        'emotional': df[df['user_intent'] == '关系陪伴'][['category', 'chinese_name', 'tools_count']],
+        'learning': df[df['user_intent'] == '技能学习'][['category', 'chinese_name', 'tools_count']],
+    }
+
+
+VIEWS = {
+    'summary': executive_summary,
+    'market_structure': market_structure,
+    'user_needs': user_needs,
+    'trends': trends,
+    'product': product_opportunities,
+    'taxonomy': taxonomy_insights,
+    'business': business,
+    'personas': personas,
+}
+
+
+def view_id(view):
+    """视图 ID 或侧边栏标题 → 视图 ID"""
+    if view in VIEWS:
+        return view
+    for key, label in VIEW_LABELS.items():
+        if label == view:
+            return key
+    raise KeyError(f"未知的分析视角: {view}")
+
+
+def compute_view(processor, view, tiers=None, scenarios=None):
+    """计算一个视图的全部结果 {名称: DataFrame / 数值}"""
+    return VIEWS[view_id(view)](processor, tiers, scenarios)
+
+
+def compute_all(processor, tiers=None, scenarios=None):
+    """批量计算全部视图 (例如生成每日报告)"""
+    return {view: func(processor, tiers, scenarios) for view, func in VIEWS.items()}
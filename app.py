@@ -4,13 +4,36 @@ AI工具市场多维度分析报告 - Streamlit交互式仪表盘
 基于 There's An AI For That 数据
 """
 
-import streamlit as st
+import os
+import json
+import inspect
+import importlib
+
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from data_processor import AIToolsDataProcessor
+import streamlit as st
+from processor_cache import ProcessorCache, DEFAULT_BUNDLE_DIR
+from precompute import ResultStore, serve_view, canonical_selection, DEFAULT_STORE_DIR
+from figure_cache import FigureCache, figure_key
+import analytics
+import downsample
+import instrumentation
+from rerun_profiler import RerunProfiler
+
+
+class LazyModule:
+    """首次访问属性时才导入的模块"""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+
+# plotly (约 100ms) 在第一次构建图表时才导入，侧边栏与页面框架先渲染
+px = LazyModule('plotly.express')
+go = LazyModule('plotly.graph_objects')
+subplots = LazyModule('plotly.subplots')
 
 # ============================================================================
 # 页面配置
@@ -134,13 +157,59 @@ st.markdown("""
 # ============================================================================
 # 数据加载
 # ============================================================================
-# 使用ttl=0强制每次重新加载数据，确保数据处理模块的更新生效
-@st.cache_data(ttl=0)
-def load_data():
-    processor = AIToolsDataProcessor()
-    return processor.get_data()
+def query_param(name):
+    """地址栏参数 (st.query_params 需要 Streamlit 1.30+，旧版本使用 experimental_get_query_params)"""
+    if hasattr(st, 'query_params'):
+        return st.query_params.get(name)
+    values = st.experimental_get_query_params().get(name)
+    return values[0] if values else None
+
+# 隐藏的「性能诊断」面板: 地址栏加 ?diagnostics=1 或设置 AI_TOOLS_DIAGNOSTICS=1 时开启，
+# 记录本次重跑中数据处理器各阶段的耗时、CPU 时间与行数。内存分配基于进程级的
+# tracemalloc，会拖慢所有会话，只能由服务端设置 AI_TOOLS_DIAGNOSTICS=1 开启
+MEMORY_DIAGNOSTICS = os.environ.get('AI_TOOLS_DIAGNOSTICS') == '1'
+DIAGNOSTICS = MEMORY_DIAGNOSTICS or query_param('diagnostics') == '1'
+
+# 重跑被 StopException/RerunException 中断时不会执行到末尾的 stop()，
+# 下次重跑开始时先停止本会话残留的记录
+stale_report = st.session_state.pop('_diagnostics', None)
+if stale_report is not None:
+    stale_report.stop()
+diagnostics = instrumentation.profile(memory=MEMORY_DIAGNOSTICS).start() if DIAGNOSTICS else None
+if diagnostics is not None:
+    st.session_state['_diagnostics'] = diagnostics
+
+# 每个会话记录最近若干次重跑中筛选、视图计算、标签页与图表的耗时 (诊断面板中显示分位数)；
+# 设置 AI_TOOLS_PROFILE_DUMP=<文件> 时每次重跑追加一行 JSON 供离线分析
+if '_rerun_profiler' not in st.session_state:
+    st.session_state['_rerun_profiler'] = RerunProfiler(dump_path=os.environ.get('AI_TOOLS_PROFILE_DUMP') or None)
+profiler = st.session_state['_rerun_profiler']
+profiler.begin()
+
+# 处理器缓存在所有会话间共享，仅当数据内容或映射表变化时重新构建；
+# 构建结果写成列式快照，其他仪表盘进程直接内存映射打开 (AI_TOOLS_BUNDLE_DIR 为空时关闭)
+BUNDLE_DIR = os.environ.get('AI_TOOLS_BUNDLE_DIR', DEFAULT_BUNDLE_DIR)
+
+@st.cache_resource
+def get_processor_cache():
+    return ProcessorCache(bundle_dir=BUNDLE_DIR or None)
+
+# 离线预计算结果库 (python precompute.py 生成)，未命中时实时计算
+PRECOMPUTED_DIR = os.environ.get('AI_TOOLS_PRECOMPUTED_DIR', DEFAULT_STORE_DIR)
 
-df = load_data()
+@st.cache_resource
+def get_result_store():
+    return ResultStore(PRECOMPUTED_DIR)
+
+# 图表缓存在所有会话间共享，键包含数据版本，数据更新后旧图表自然失效
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+# 标签页惰性渲染: 只执行当前选中的标签页，切换标签页时重跑 (AI_TOOLS_LAZY_TABS=0 时全部渲染)；
+# st.tabs 的 key/on_change 需要较新的 Streamlit，不支持时同样全部渲染
+LAZY_TABS = (os.environ.get('AI_TOOLS_LAZY_TABS', '1') != '0'
+             and 'on_change' in inspect.signature(st.tabs).parameters)
 
 # ============================================================================
 # 侧边栏导航
@@ -150,16 +219,15 @@ st.sidebar.markdown("---")
 
 analysis_view = st.sidebar.radio(
     "📊 选择分析视角",
-    [
-        "🏠 执行摘要",
-        "🚀 市场结构视角",
-        "🧭 用户需求视角", 
-        "🔎 趋势机会视角",
-        "🪜 产品机会视角",
-        "🧱 分类系统视角",
-        "🧲 商业化视角",
-        "🧬 用户角色视角",
-    ]
+    list(analytics.VIEW_LABELS.values())
+)
+
+# 导航先渲染，再获取处理器 (冷启动时构建或打开列式快照)
+processor = get_processor_cache().get()
+
+# 各视图只计算自己读取的维度 (见 analytics.VIEW_COLUMNS)
+df = processor.get_data(
+    analytics.FILTER_COLUMNS + analytics.VIEW_COLUMNS[analytics.view_id(analysis_view)]
 )
 
 st.sidebar.markdown("---")
@@ -179,19 +247,63 @@ selected_scenarios = st.sidebar.multiselect(
     default=df['user_scenario'].unique().tolist()
 )
 
-# 应用筛选
-df_filtered = df[
-    (df['market_tier'].isin(selected_tiers)) &
-    (df['user_scenario'].isin(selected_scenarios))
-]
+# 应用筛选 (预计算位图索引)
+with profiler.span('filter', 'df_filtered'):
+    df_filtered = processor.filter(tiers=selected_tiers, scenarios=selected_scenarios)
 
 st.sidebar.markdown("---")
 st.sidebar.markdown(f"**当前数据:** {len(df_filtered)} 个分类")
 st.sidebar.markdown(f"**工具总数:** {df_filtered['tools_count'].sum():,}")
 
+# 大图表默认在服务端降采样，限制每个图表发送到浏览器的点数
+full_resolution = st.sidebar.toggle(
+    "全分辨率图表",
+    value=False,
+    help=f"关闭时散点图/曲线最多绘制 {downsample.DEFAULT_MAX_POINTS:,} 个点，柱状图最多 {downsample.DEFAULT_MAX_BARS} 根柱子"
+)
+point_limit = None if full_resolution else downsample.DEFAULT_MAX_POINTS
+bar_limit = None if full_resolution else downsample.DEFAULT_MAX_BARS
+
 # ============================================================================
 # 辅助函数
 # ============================================================================
+def view_result(view):
+    """当前筛选条件下的视图计算结果 (优先读取预计算结果)"""
+    with profiler.span('compute', view):
+        return serve_view(get_result_store(), processor, view, selected_tiers, selected_scenarios)
+
+tab_labels = {}
+
+def view_tabs(labels):
+    """当前视图的标签页 (惰性模式下记录选中状态，各视图独立)"""
+    if not LAZY_TABS:
+        tabs = st.tabs(labels)
+    else:
+        tabs = st.tabs(labels, key=f"tabs_{analytics.view_id(analysis_view)}", on_change='rerun')
+    tab_labels.update({id(tab): label for tab, label in zip(tabs, labels)})
+    return tabs
+
+def tab_open(tab):
+    """标签页是否需要渲染 (未记录选中状态或不支持 open 时全部渲染)，需要时开始记录该标签页耗时"""
+    if LAZY_TABS and getattr(tab, 'open', None) is False:
+        profiler.close('tab')
+        return False
+    profiler.segment('tab', tab_labels.get(id(tab)))
+    return True
+
+def show_chart(tab, name, build, points=None, limit=None):
+    """渲染图表: 相同视图/标签页/筛选条件/数据版本下复用缓存的图表
+
+    降采样图表传入原始点数 points 与上限 limit，超出上限时提示已降采样。
+    """
+    if limit is not None and points is not None and points > limit:
+        st.caption(f"共 {points:,} 个数据点，已降采样至最多 {limit:,} 个；可在侧边栏开启全分辨率图表")
+    view = analytics.view_id(analysis_view)
+    selection = canonical_selection(processor, view, selected_tiers, selected_scenarios)
+    key = figure_key(view, tab, name if limit is None else f"{name}@{limit}", selection, processor.version())
+    with profiler.span('chart', f"{tab}/{name}"):
+        st.plotly_chart(get_figure_cache().figure(key, build), use_container_width=True)
+
 def create_metric_card(value, label, delta=None):
     """创建指标卡片"""
     delta_html = f"<div style='color: {'green' if delta and delta > 0 else 'red'}; font-size: 0.8rem;'>{delta:+.1f}%</div>" if delta else ""
@@ -207,6 +319,8 @@ def create_insight_card(content, card_type="default"):
     """创建洞察卡片"""
     return f'<div class="insight-card {card_type}">{content}</div>'
 
+profiler.segment('view', analytics.view_id(analysis_view))
+
 # ============================================================================
 # 视图1: 执行摘要
 # ============================================================================
@@ -214,19 +328,22 @@ if analysis_view == "🏠 执行摘要":
     st.markdown('<h1 class="main-title">🤖 AI工具市场深度分析报告</h1>', unsafe_allow_html=True)
     st.markdown('<p style="text-align: center; color: #666;">基于 There\'s An AI For That 数据 | 2025年11月30日</p>', unsafe_allow_html=True)
     
+    summary = view_result('summary')
+    kpis = summary['kpis']
+    
     # KPI指标行
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        st.metric("📊 分析分类", f"{len(df):,}")
+        st.metric("📊 分析分类", f"{kpis['categories']:,}")
     with col2:
-        st.metric("🔧 AI工具总数", f"{df['tools_count'].sum():,}")
+        st.metric("🔧 AI工具总数", f"{kpis['total_tools']:,}")
     with col3:
-        st.metric("📈 头部占比(Top10)", f"{df.head(10)['tools_count'].sum()/df['tools_count'].sum()*100:.1f}%")
+        st.metric("📈 头部占比(Top10)", f"{kpis['top10_share']:.1f}%")
     with col4:
-        st.metric("🎯 平均工具数", f"{df['tools_count'].mean():.0f}")
+        st.metric("🎯 平均工具数", f"{kpis['mean_tools']:.0f}")
     with col5:
-        st.metric("📉 中位数", f"{df['tools_count'].median():.0f}")
+        st.metric("📉 中位数", f"{kpis['median_tools']:.0f}")
     
     st.markdown("---")
     
@@ -235,57 +352,48 @@ if analysis_view == "🏠 执行摘要":
     
     with col1:
         st.markdown("### 📊 Top 15 分类排行")
-        fig = px.bar(
-            df.head(15),
-            x='tools_count',
-            y='category',
-            orientation='h',
-            color='tools_count',
-            color_continuous_scale='Blues',
-            text='tools_count'
-        )
-        fig.update_layout(
-            height=500,
-            showlegend=False,
-            yaxis={'categoryorder': 'total ascending'},
-            xaxis_title="AI工具数量",
-            yaxis_title="",
-            coloraxis_showscale=False
-        )
-        fig.update_traces(textposition='outside')
-        st.plotly_chart(fig, use_container_width=True)
+        def build_fig():
+            fig = px.bar(
+                summary['top15'],
+                x='tools_count',
+                y='category',
+                orientation='h',
+                color='tools_count',
+                color_continuous_scale='Blues',
+                text='tools_count'
+            )
+            fig.update_layout(
+                height=500,
+                showlegend=False,
+                yaxis={'categoryorder': 'total ascending'},
+                xaxis_title="AI工具数量",
+                yaxis_title="",
+                coloraxis_showscale=False
+            )
+            fig.update_traces(textposition='outside')
+            return fig
+        show_chart('main', 'top15_bar', build_fig)
     
     with col2:
         st.markdown("### 📊 工具数量占比")
-        # 构建饼图数据 - 计算工具数量占比
-        total_tools = df['tools_count'].sum()
-        top5 = df.head(5).copy()
-        top5['market_share'] = (top5['tools_count'] / total_tools * 100).round(1)
-        
-        others_count = df['tools_count'].iloc[5:].sum()
-        others_share = (others_count / total_tools * 100).round(1)
-        
-        others = pd.DataFrame({
-            'category': ['Others'],
-            'tools_count': [others_count],
-            'market_share': [others_share]
-        })
-        pie_data = pd.concat([top5[['category', 'tools_count', 'market_share']], others])
-        
-        fig = px.pie(
-            pie_data,
-            values='market_share',
-            names='category',
-            hole=0.4,
-            color_discrete_sequence=px.colors.sequential.Blues_r
-        )
-        fig.update_layout(height=500)
-        fig.update_traces(
-            textposition='inside', 
-            textinfo='percent+label',
-            hovertemplate='<b>%{label}</b><br>占比: %{value:.1f}%<br>工具数: ' + pie_data['tools_count'].astype(str) + '<extra></extra>'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        pie_data = summary['share_pie']
+        
+        def build_fig():
+            fig = px.pie(
+                pie_data,
+                values='market_share',
+                names='category',
+                hole=0.4,
+                color_discrete_sequence=px.colors.sequential.Blues_r
+            )
+            fig.update_layout(height=500)
+            fig.update_traces(
+                textposition='inside', 
+                textinfo='percent+label',
+                hovertemplate='<b>%{label}</b><br>占比: %{value:.1f}%<br>工具数: ' + pie_data['tools_count'].astype(str) + '<extra></extra>'
+            )
+            return fig
+        show_chart('main', 'share_pie', build_fig)
     
     # 核心洞察
     st.markdown("### 💡 核心洞察")
@@ -316,145 +424,141 @@ if analysis_view == "🏠 执行摘要":
 elif analysis_view == "🚀 市场结构视角":
     st.markdown('<h2 class="section-header">🚀 市场结构视角 - Macro Market Structure</h2>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["📊 供给密度分析", "📈 赛道分层结构", "🎯 颗粒度分析"])
+    result = view_result('market_structure')
+    
+    tab1, tab2, tab3 = view_tabs(["📊 供给密度分析", "📈 赛道分层结构", "🎯 颗粒度分析"])
     
     with tab1:
-        st.markdown("#### 1️⃣ 赛道供给饱和度指数")
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            # 饱和度热力图
-            df_saturation = df_filtered.copy()
-            df_saturation['saturation_level'] = pd.cut(
-                df_saturation['saturation_index'],
-                bins=[0, 5, 15, 30, 50, 100],
-                labels=['蓝海空白', '蓝海机会', '竞争中等', '红海预警', '超级红海']
-            )
-            
-            fig = px.treemap(
-                df_saturation.head(50),
-                path=['saturation_level', 'category'],
-                values='tools_count',
-                color='saturation_index',
-                color_continuous_scale='RdYlGn_r',
-                title='赛道饱和度树状图 (Top 50)'
-            )
-            fig.update_layout(height=600)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("##### 🔴 超级红海 (饱和度 > 50%)")
-            red_ocean = df_filtered[df_filtered['saturation_index'] > 50][['category', 'tools_count', 'chinese_name']]
-            st.dataframe(red_ocean, hide_index=True, use_container_width=True)
+        if tab_open(tab1):
+            st.markdown("#### 1️⃣ 赛道供给饱和度指数")
+        
+            col1, col2 = st.columns([2, 1])
+        
+            with col1:
+                # 饱和度热力图
+                def build_fig():
+                    fig = px.treemap(
+                        result['saturation_top50'],
+                        path=['saturation_level', 'category'],
+                        values='tools_count',
+                        color='saturation_index',
+                        color_continuous_scale='RdYlGn_r',
+                        title='赛道饱和度树状图 (Top 50)'
+                    )
+                    fig.update_layout(height=600)
+                    return fig
+                show_chart('tab1', 'saturation_treemap', build_fig)
+        
+            with col2:
+                st.markdown("##### 🔴 超级红海 (饱和度 > 50%)")
+                st.dataframe(result['super_red_ocean'], hide_index=True, use_container_width=True)
             
-            st.markdown("##### 🔵 蓝海空白 (饱和度 < 5%)")
-            blue_ocean = df_filtered[df_filtered['saturation_index'] < 5].tail(15)[['category', 'tools_count', 'chinese_name']]
-            st.dataframe(blue_ocean, hide_index=True, use_container_width=True)
+                st.markdown("##### 🔵 蓝海空白 (饱和度 < 5%)")
+                st.dataframe(result['blue_ocean_gap'], hide_index=True, use_container_width=True)
     
     with tab2:
-        st.markdown("#### 2️⃣ 市场分层结构分析")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 层级分布
-            tier_stats = df_filtered.groupby('market_tier').agg({
-                'tools_count': ['count', 'sum', 'mean']
-            }).round(0)
-            tier_stats.columns = ['分类数量', '工具总数', '平均工具数']
-            tier_stats['工具占比%'] = (tier_stats['工具总数'] / tier_stats['工具总数'].sum() * 100).round(1)
-            tier_stats = tier_stats.reset_index()
-            
-            fig = px.sunburst(
-                df_filtered,
-                path=['market_tier', 'category'],
-                values='tools_count',
-                color='market_tier',
-                color_discrete_map={
-                    'Tier 1 头部': '#F39C12',
-                    'Tier 2 腰部上': '#1E3A5F',
-                    'Tier 3 腰部': '#3D7EAA',
-                    'Tier 4 腰部下': '#5DADE2',
-                    'Tier 5 尾部': '#AED6F1'
-                },
-                title='市场层级旭日图'
-            )
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("##### 📊 层级统计详情")
-            st.dataframe(tier_stats, hide_index=True, use_container_width=True)
+        if tab_open(tab2):
+            st.markdown("#### 2️⃣ 市场分层结构分析")
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                # 层级分布
+                def build_fig():
+                    fig = px.sunburst(
+                        df_filtered,
+                        path=['market_tier', 'category'],
+                        values='tools_count',
+                        color='market_tier',
+                        color_discrete_map={
+                            'Tier 1 头部': '#F39C12',
+                            'Tier 2 腰部上': '#1E3A5F',
+                            'Tier 3 腰部': '#3D7EAA',
+                            'Tier 4 腰部下': '#5DADE2',
+                            'Tier 5 尾部': '#AED6F1'
+                        },
+                        title='市场层级旭日图'
+                    )
+                    fig.update_layout(height=500)
+                    return fig
+                show_chart('tab2', 'tier_sunburst', build_fig)
+        
+            with col2:
+                st.markdown("##### 📊 层级统计详情")
+                st.dataframe(result['tier_stats'], hide_index=True, use_container_width=True)
             
-            # 头部集中度分析
-            st.markdown("##### 📈 头部集中度")
-            top_n_options = [5, 10, 20, 50]
-            concentration = []
-            for n in top_n_options:
-                share = df_filtered.head(n)['tools_count'].sum() / df_filtered['tools_count'].sum() * 100
-                concentration.append({'Top N': f'Top {n}', '工具占比': f'{share:.1f}%'})
-            st.dataframe(pd.DataFrame(concentration), hide_index=True, use_container_width=True)
-        
-        # 累计份额曲线
-        st.markdown("##### 📉 帕累托曲线 - 累计工具占比")
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=list(range(1, len(df_filtered)+1)),
-            y=df_filtered['cumulative_share'],
-            fill='tozeroy',
-            name='累计份额',
-            line=dict(color='#1E3A5F', width=2)
-        ))
-        fig.add_hline(y=80, line_dash="dash", line_color="#F39C12", annotation_text="80%线")
-        fig.update_layout(
-            xaxis_title="分类排名",
-            yaxis_title="累计工具占比 (%)",
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
+                # 头部集中度分析 (筛选后数据的前缀和)
+                st.markdown("##### 📈 头部集中度")
+                st.dataframe(result['concentration'], hide_index=True, use_container_width=True)
+        
+            # 累计份额曲线 (按筛选后的数据重新计算)
+            st.markdown("##### 📉 帕累托曲线 - 累计工具占比")
+            pareto = result['pareto']
+            def build_fig():
+                fig = go.Figure()
+                curve = downsample.downsample_curve(pareto, 'rank', 'cumulative_share', point_limit)
+                fig.add_trace(go.Scatter(
+                    x=curve['rank'],
+                    y=curve['cumulative_share'],
+                    fill='tozeroy',
+                    name='累计份额',
+                    line=dict(color='#1E3A5F', width=2)
+                ))
+                fig.add_hline(y=80, line_dash="dash", line_color="#F39C12", annotation_text="80%线")
+                if len(pareto):
+                    fig.add_vline(x=result['pareto_80'], line_dash="dot", line_color="#F39C12",
+                                  annotation_text=f"前 {result['pareto_80']} 个分类")
+                fig.update_layout(
+                    xaxis_title="分类排名",
+                    yaxis_title="累计工具占比 (%)",
+                    height=400
+                )
+                return fig
+            show_chart('tab2', 'pareto_curve', build_fig, len(pareto), point_limit)
     
     with tab3:
-        st.markdown("#### 3️⃣ 赛道颗粒度分析")
-        
-        # 颗粒度分布
-        granularity_stats = df_filtered.groupby('granularity').agg({
-            'tools_count': ['count', 'mean', 'sum']
-        }).round(0)
-        granularity_stats.columns = ['分类数', '平均工具数', '工具总数']
-        granularity_stats = granularity_stats.reset_index()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.bar(
-                granularity_stats,
-                x='granularity',
-                y='分类数',
-                color='平均工具数',
-                color_continuous_scale='Blues',
-                title='各颗粒度级别的分类数量'
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        if tab_open(tab3):
+            st.markdown("#### 3️⃣ 赛道颗粒度分析")
+        
+            # 颗粒度分布
+            granularity_stats = result['granularity_stats']
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                def build_fig():
+                    fig = px.bar(
+                        granularity_stats,
+                        x='granularity',
+                        y='分类数',
+                        color='平均工具数',
+                        color_continuous_scale='Blues',
+                        title='各颗粒度级别的分类数量'
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                show_chart('tab3', 'granularity_bar', build_fig)
+        
+            with col2:
+                def build_fig():
+                    fig = px.scatter(
+                        downsample.density_sample(df_filtered, 'tools_count', 'rank', point_limit,
+                                                  by='granularity', log_x=True),
+                        x='tools_count',
+                        y='rank',
+                        color='granularity',
+                        hover_name='category',
+                        title='颗粒度 vs 工具数量分布',
+                        log_x=True
+                    )
+                    fig.update_layout(height=400, yaxis_title='排名')
+                    return fig
+                show_chart('tab3', 'granularity_scatter', build_fig, len(df_filtered), point_limit)
         
-        with col2:
-            fig = px.scatter(
-                df_filtered,
-                x='tools_count',
-                y='rank',
-                color='granularity',
-                hover_name='category',
-                title='颗粒度 vs 工具数量分布',
-                log_x=True
-            )
-            fig.update_layout(height=400, yaxis_title='排名')
-            st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown(create_insight_card(
-            "💡 <b>颗粒度洞察:</b> 大分类(Creativity, Business)覆盖范围广，工具数量多，竞争激烈；小分类(Wine, Tarot, Wedding)定位精准，工具数量少，可能存在细分机会。",
-            "gold"
-        ), unsafe_allow_html=True)
+            st.markdown(create_insight_card(
+                "💡 <b>颗粒度洞察:</b> 大分类(Creativity, Business)覆盖范围广，工具数量多，竞争激烈；小分类(Wine, Tarot, Wedding)定位精准，工具数量少，可能存在细分机会。",
+                "gold"
+            ), unsafe_allow_html=True)
 
 # ============================================================================
 # 视图3: 用户需求视角
@@ -462,131 +566,132 @@ elif analysis_view == "🚀 市场结构视角":
 elif analysis_view == "🧭 用户需求视角":
     st.markdown('<h2 class="section-header">🧭 用户需求视角 - User & Jobs-to-be-Done</h2>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["👤 用户场景分析", "🎯 用户意图分析", "📊 竞争强度分析"])
+    result = view_result('user_needs')
+    
+    tab1, tab2, tab3 = view_tabs(["👤 用户场景分析", "🎯 用户意图分析", "📊 竞争强度分析"])
     
     with tab1:
-        st.markdown("#### 4️⃣ 用户行为领域分类")
-        
-        # 场景分布
-        scenario_stats = df_filtered.groupby('user_scenario').agg({
-            'tools_count': ['count', 'sum', 'mean']
-        }).round(0)
-        scenario_stats.columns = ['分类数', '工具总数', '平均工具数']
-        scenario_stats = scenario_stats.sort_values('工具总数', ascending=False).reset_index()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.bar(
-                scenario_stats,
-                x='user_scenario',
-                y='工具总数',
-                color='分类数',
-                color_continuous_scale='Blues',
-                title='用户场景工具分布'
-            )
-            fig.update_layout(height=450, xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            fig = px.pie(
-                scenario_stats,
-                values='工具总数',
-                names='user_scenario',
-                title='场景份额分布',
-                hole=0.3
-            )
-            fig.update_layout(height=450)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # 场景详情表
-        st.markdown("##### 📊 各场景详细数据")
-        st.dataframe(scenario_stats, hide_index=True, use_container_width=True)
+        if tab_open(tab1):
+            st.markdown("#### 4️⃣ 用户行为领域分类")
+        
+            # 场景分布
+            scenario_stats = result['scenario_stats']
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                def build_fig():
+                    fig = px.bar(
+                        scenario_stats,
+                        x='user_scenario',
+                        y='工具总数',
+                        color='分类数',
+                        color_continuous_scale='Blues',
+                        title='用户场景工具分布'
+                    )
+                    fig.update_layout(height=450, xaxis_tickangle=-45)
+                    return fig
+                show_chart('tab1', 'scenario_bar', build_fig)
+        
+            with col2:
+                def build_fig():
+                    fig = px.pie(
+                        scenario_stats,
+                        values='工具总数',
+                        names='user_scenario',
+                        title='场景份额分布',
+                        hole=0.3
+                    )
+                    fig.update_layout(height=450)
+                    return fig
+                show_chart('tab1', 'scenario_pie', build_fig)
+        
+            # 场景详情表
+            st.markdown("##### 📊 各场景详细数据")
+            st.dataframe(scenario_stats, hide_index=True, use_container_width=True)
     
     with tab2:
-        st.markdown("#### 5️⃣ 用户意图类型分析")
-        
-        intent_stats = df_filtered.groupby('user_intent').agg({
-            'tools_count': ['count', 'sum', 'mean']
-        }).round(0)
-        intent_stats.columns = ['分类数', '工具总数', '平均工具数']
-        intent_stats = intent_stats.sort_values('工具总数', ascending=False).reset_index()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.treemap(
-                df_filtered,
-                path=['user_intent', 'category'],
-                values='tools_count',
-                color='tools_count',
-                color_continuous_scale='Blues',
-                title='用户意图树状图 (按工具数量)'
-            )
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # 雷达图 - 只显示工具数量分布
-            fig = go.Figure()
-            fig.add_trace(go.Scatterpolar(
-                r=intent_stats['工具总数'].head(8) / intent_stats['工具总数'].max() * 100,
-                theta=intent_stats['user_intent'].head(8),
-                fill='toself',
-                name='工具数量占比',
-                line_color='#1E3A5F'
-            ))
-            fig.add_trace(go.Scatterpolar(
-                r=intent_stats['分类数'].head(8) / intent_stats['分类数'].max() * 100,
-                theta=intent_stats['user_intent'].head(8),
-                fill='toself',
-                name='分类数量占比',
-                line_color='#F39C12'
-            ))
-            fig.update_layout(
-                polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-                title='意图类型分布雷达图',
-                height=500
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        st.dataframe(intent_stats, hide_index=True, use_container_width=True)
+        if tab_open(tab2):
+            st.markdown("#### 5️⃣ 用户意图类型分析")
+        
+            intent_stats = result['intent_stats']
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                def build_fig():
+                    fig = px.treemap(
+                        df_filtered,
+                        path=['user_intent', 'category'],
+                        values='tools_count',
+                        color='tools_count',
+                        color_continuous_scale='Blues',
+                        title='用户意图树状图 (按工具数量)'
+                    )
+                    fig.update_layout(height=500)
+                    return fig
+                show_chart('tab2', 'intent_treemap', build_fig)
+        
+            with col2:
+                # 雷达图 - 只显示工具数量分布
+                def build_fig():
+                    fig = go.Figure()
+                    fig.add_trace(go.Scatterpolar(
+                        r=intent_stats['工具总数'].head(8) / intent_stats['工具总数'].max() * 100,
+                        theta=intent_stats['user_intent'].head(8),
+                        fill='toself',
+                        name='工具数量占比',
+                        line_color='#1E3A5F'
+                    ))
+                    fig.add_trace(go.Scatterpolar(
+                        r=intent_stats['分类数'].head(8) / intent_stats['分类数'].max() * 100,
+                        theta=intent_stats['user_intent'].head(8),
+                        fill='toself',
+                        name='分类数量占比',
+                        line_color='#F39C12'
+                    ))
+                    fig.update_layout(
+                        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+                        title='意图类型分布雷达图',
+                        height=500
+                    )
+                    return fig
+                show_chart('tab2', 'intent_radar', build_fig)
+        
+            st.dataframe(intent_stats, hide_index=True, use_container_width=True)
     
     with tab3:
-        st.markdown("#### 6️⃣ 竞争强度分析")
-        
-        st.info("💡 **说明**: 竞争强度基于工具数量客观衡量，工具数量越多表示该赛道竞争越激烈。")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("##### 🔵 低竞争赛道 (工具数量最少)")
-            low_competition = df_filtered.nsmallest(15, 'tools_count')[
-                ['category', 'chinese_name', 'tools_count', 'rank']
-            ]
-            st.dataframe(low_competition, hide_index=True, use_container_width=True)
-        
-        with col2:
-            st.markdown("##### 🔴 高竞争赛道 (工具数量最多)")
-            high_competition = df_filtered.nlargest(15, 'tools_count')[
-                ['category', 'chinese_name', 'tools_count', 'rank']
-            ]
-            st.dataframe(high_competition, hide_index=True, use_container_width=True)
-        
-        # 竞争强度分布图
-        fig = px.scatter(
-            df_filtered,
-            x='rank',
-            y='tools_count',
-            color='market_tier',
-            hover_name='category',
-            hover_data=['chinese_name'],
-            title='赛道竞争分布图 (排名 vs 工具数量)'
-        )
-        fig.add_hline(y=500, line_dash="dash", line_color="red", annotation_text="高竞争线 (500+)")
-        fig.add_hline(y=100, line_dash="dash", line_color="green", annotation_text="低竞争线 (<100)")
-        fig.update_layout(height=500, xaxis_title="排名", yaxis_title="工具数量")
-        st.plotly_chart(fig, use_container_width=True)
+        if tab_open(tab3):
+            st.markdown("#### 6️⃣ 竞争强度分析")
+        
+            st.info("💡 **说明**: 竞争强度基于工具数量客观衡量，工具数量越多表示该赛道竞争越激烈。")
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.markdown("##### 🔵 低竞争赛道 (工具数量最少)")
+                st.dataframe(result['low_competition'], hide_index=True, use_container_width=True)
+        
+            with col2:
+                st.markdown("##### 🔴 高竞争赛道 (工具数量最多)")
+                st.dataframe(result['high_competition'], hide_index=True, use_container_width=True)
+        
+            # 竞争强度分布图
+            def build_fig():
+                fig = px.scatter(
+                    downsample.density_sample(df_filtered, 'rank', 'tools_count', point_limit, by='market_tier'),
+                    x='rank',
+                    y='tools_count',
+                    color='market_tier',
+                    hover_name='category',
+                    hover_data=['chinese_name'],
+                    title='赛道竞争分布图 (排名 vs 工具数量)'
+                )
+                fig.add_hline(y=500, line_dash="dash", line_color="red", annotation_text="高竞争线 (500+)")
+                fig.add_hline(y=100, line_dash="dash", line_color="green", annotation_text="低竞争线 (<100)")
+                fig.update_layout(height=500, xaxis_title="排名", yaxis_title="工具数量")
+                return fig
+            show_chart('tab3', 'competition_scatter', build_fig, len(df_filtered), point_limit)
 
 # ============================================================================
 # 视图4: 趋势机会视角
@@ -594,122 +699,112 @@ elif analysis_view == "🧭 用户需求视角":
 elif analysis_view == "🔎 趋势机会视角":
     st.markdown('<h2 class="section-header">🔎 趋势机会视角 - Trend & Opportunity</h2>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["🚀 大模型推动赛道", "💢 痛点驱动赛道", "🎯 机会象限分析"])
+    result = view_result('trends')
+    
+    tab1, tab2, tab3 = view_tabs(["🚀 大模型推动赛道", "💢 痛点驱动赛道", "🎯 机会象限分析"])
     
     with tab1:
-        st.markdown("#### 7️⃣ 大模型推动的新兴赛道")
-        
-        llm_categories = df_filtered[df_filtered['llm_driven']]
-        non_llm = df_filtered[~df_filtered['llm_driven']]
+        if tab_open(tab1):
+            st.markdown("#### 7️⃣ 大模型推动的新兴赛道")
         
-        col1, col2 = st.columns([1, 2])
+            col1, col2 = st.columns([1, 2])
         
-        with col1:
-            st.markdown("##### 🤖 LLM推动赛道")
-            st.dataframe(
-                llm_categories[['category', 'chinese_name', 'tools_count', 'rank']],
-                hide_index=True,
-                use_container_width=True
-            )
+            with col1:
+                st.markdown("##### 🤖 LLM推动赛道")
+                st.dataframe(result['llm_driven'], hide_index=True, use_container_width=True)
             
-            st.markdown(create_insight_card(
-                "💡 这些赛道因 GPT/Claude/Gemini 而诞生或爆发，代表AI原生应用方向",
-                "gold"
-            ), unsafe_allow_html=True)
-        
-        with col2:
-            # 对比图
-            compare_data = pd.DataFrame({
-                '类型': ['LLM推动', '传统赛道'],
-                '分类数': [len(llm_categories), len(non_llm)],
-                '平均工具数': [llm_categories['tools_count'].mean(), non_llm['tools_count'].mean()],
-                '工具总数': [llm_categories['tools_count'].sum(), non_llm['tools_count'].sum()]
-            })
+                st.markdown(create_insight_card(
+                    "💡 这些赛道因 GPT/Claude/Gemini 而诞生或爆发，代表AI原生应用方向",
+                    "gold"
+                ), unsafe_allow_html=True)
+        
+            with col2:
+                # 对比图
+                compare_data = result['llm_comparison']
             
-            fig = make_subplots(rows=1, cols=3, subplot_titles=['分类数量', '平均工具数', '工具总数'])
+                def build_fig():
+                    fig = subplots.make_subplots(rows=1, cols=3, subplot_titles=['分类数量', '平均工具数', '工具总数'])
             
-            fig.add_trace(go.Bar(x=compare_data['类型'], y=compare_data['分类数'], marker_color=['#F39C12', '#3D7EAA']), row=1, col=1)
-            fig.add_trace(go.Bar(x=compare_data['类型'], y=compare_data['平均工具数'], marker_color=['#F39C12', '#3D7EAA']), row=1, col=2)
-            fig.add_trace(go.Bar(x=compare_data['类型'], y=compare_data['工具总数'], marker_color=['#F39C12', '#3D7EAA']), row=1, col=3)
+                    fig.add_trace(go.Bar(x=compare_data['类型'], y=compare_data['分类数'], marker_color=['#F39C12', '#3D7EAA']), row=1, col=1)
+                    fig.add_trace(go.Bar(x=compare_data['类型'], y=compare_data['平均工具数'], marker_color=['#F39C12', '#3D7EAA']), row=1, col=2)
+                    fig.add_trace(go.Bar(x=compare_data['类型'], y=compare_data['工具总数'], marker_color=['#F39C12', '#3D7EAA']), row=1, col=3)
             
-            fig.update_layout(height=400, showlegend=False, title='LLM推动 vs 传统赛道对比')
-            st.plotly_chart(fig, use_container_width=True)
+                    fig.update_layout(height=400, showlegend=False, title='LLM推动 vs 传统赛道对比')
+                    return fig
+                show_chart('tab1', 'llm_comparison', build_fig)
     
     with tab2:
-        st.markdown("#### 8️⃣ 现实痛点驱动的赛道")
-        
-        pain_categories = df_filtered[df_filtered['pain_driven']]
-        
-        col1, col2 = st.columns(2)
+        if tab_open(tab2):
+            st.markdown("#### 8️⃣ 现实痛点驱动的赛道")
+        
+            pain_categories = result['pain_driven']
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.markdown("##### 💢 痛点驱动赛道")
+                st.dataframe(
+                    pain_categories[['category', 'chinese_name', 'tools_count', 'rank']],
+                    hide_index=True,
+                    use_container_width=True
+                )
+        
+            with col2:
+                def build_fig():
+                    fig = px.bar(
+                        pain_categories,
+                        x='category',
+                        y='tools_count',
+                        color='tools_count',
+                        color_continuous_scale='Blues',
+                        title='痛点赛道工具分布'
+                    )
+                    fig.update_layout(height=400, xaxis_tickangle=-45)
+                    return fig
+                show_chart('tab2', 'pain_bar', build_fig)
         
-        with col1:
-            st.markdown("##### 💢 痛点驱动赛道")
-            st.dataframe(
-                pain_categories[['category', 'chinese_name', 'tools_count', 'rank']],
-                hide_index=True,
-                use_container_width=True
-            )
-        
-        with col2:
-            fig = px.bar(
-                pain_categories,
-                x='category',
-                y='tools_count',
-                color='tools_count',
-                color_continuous_scale='Blues',
-                title='痛点赛道工具分布'
-            )
-            fig.update_layout(height=400, xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown("""
-        **痛点来源分析 (基于分类名称推断):**
-        - 🎯 **求职压力**: Job interview, Interview preparation, Resume
-        - 💔 **情感孤独**: Emotional support, Mental health, Therapy  
-        - ⏰ **效率焦虑**: Productivity, Automation
-        - 🏥 **健康意识**: Health, Fitness
-        """)
+            st.markdown("""
+            **痛点来源分析 (基于分类名称推断):**
+            - 🎯 **求职压力**: Job interview, Interview preparation, Resume
+            - 💔 **情感孤独**: Emotional support, Mental health, Therapy  
+            - ⏰ **效率焦虑**: Productivity, Automation
+            - 🏥 **健康意识**: Health, Fitness
+            """)
     
     with tab3:
-        st.markdown("#### 9️⃣ 竞争格局分析")
-        
-        st.info("💡 **说明**: 竞争格局仅基于工具数量划分，工具数量多表示竞争激烈，不代表商业价值判断。")
-        
-        quadrant_stats = df_filtered.groupby('competition_quadrant').agg({
-            'tools_count': ['count', 'sum', 'mean']
-        }).round(0)
-        quadrant_stats.columns = ['分类数', '工具总数', '平均工具数']
-        quadrant_stats = quadrant_stats.reset_index()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.pie(
-                quadrant_stats,
-                values='分类数',
-                names='competition_quadrant',
-                color='competition_quadrant',
-                color_discrete_map={
-                    '红海赛道 (工具数≥500)': '#E74C3C',
-                    '竞争赛道 (200≤工具数<500)': '#F39C12',
-                    '机会赛道 (100≤工具数<200)': '#3498DB',
-                    '蓝海赛道 (工具数<100)': '#27AE60'
-                },
-                title='竞争格局分布'
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.dataframe(quadrant_stats, hide_index=True, use_container_width=True)
+        if tab_open(tab3):
+            st.markdown("#### 9️⃣ 竞争格局分析")
+        
+            st.info("💡 **说明**: 竞争格局仅基于工具数量划分，工具数量多表示竞争激烈，不代表商业价值判断。")
+        
+            quadrant_stats = result['quadrant_stats']
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                def build_fig():
+                    fig = px.pie(
+                        quadrant_stats,
+                        values='分类数',
+                        names='competition_quadrant',
+                        color='competition_quadrant',
+                        color_discrete_map={
+                            '红海赛道 (工具数≥500)': '#E74C3C',
+                            '竞争赛道 (200≤工具数<500)': '#F39C12',
+                            '机会赛道 (100≤工具数<200)': '#3498DB',
+                            '蓝海赛道 (工具数<100)': '#27AE60'
+                        },
+                        title='竞争格局分布'
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                show_chart('tab3', 'quadrant_pie', build_fig)
+        
+            with col2:
+                st.dataframe(quadrant_stats, hide_index=True, use_container_width=True)
             
-            st.markdown("##### 🔵 蓝海赛道 (工具数<100)")
-            blue_ocean = df_filtered[df_filtered['competition_quadrant'] == '蓝海赛道 (工具数<100)']
-            st.dataframe(
-                blue_ocean[['category', 'chinese_name', 'tools_count', 'rank']].head(10),
-                hide_index=True,
-                use_container_width=True
-            )
+                st.markdown("##### 🔵 蓝海赛道 (工具数<100)")
+                st.dataframe(result['blue_ocean'], hide_index=True, use_container_width=True)
 
 # ============================================================================
 # 视图5: 产品机会视角
@@ -717,112 +812,117 @@ elif analysis_view == "🔎 趋势机会视角":
 elif analysis_view == "🪜 产品机会视角":
     st.markdown('<h2 class="section-header">🪜 产品机会视角 - Product Opportunity</h2>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["🔴 高竞争赛道", "🔵 低竞争赛道", "🔍 纵深/横切机会"])
+    result = view_result('product')
+    
+    tab1, tab2, tab3 = view_tabs(["🔴 高竞争赛道", "🔵 低竞争赛道", "🔍 纵深/横切机会"])
     
     with tab1:
-        st.markdown("#### 10️⃣ 高竞争赛道 (工具数≥500)")
-        
-        st.info("💡 **说明**: 高竞争赛道工具数量多，可能存在差异化机会，但具体价值需结合实际市场调研判断。")
+        if tab_open(tab1):
+            st.markdown("#### 10️⃣ 高竞争赛道 (工具数≥500)")
+        
+            st.info("💡 **说明**: 高竞争赛道工具数量多，可能存在差异化机会，但具体价值需结合实际市场调研判断。")
+        
+            high_supply = result['high_supply']
+        
+            col1, col2 = st.columns([1, 1])
+        
+            with col1:
+                st.markdown("##### 🔴 高竞争赛道列表")
+                st.dataframe(
+                    high_supply[['category', 'chinese_name', 'tools_count', 'rank']],
+                    hide_index=True,
+                    use_container_width=True
+                )
+        
+            with col2:
+                def build_fig():
+                    fig = px.bar(
+                        downsample.top_bars(high_supply, 'tools_count', bar_limit),
+                        x='category',
+                        y='tools_count',
+                        color='tools_count',
+                        color_continuous_scale='Reds',
+                        title='高竞争赛道工具分布'
+                    )
+                    fig.update_layout(height=400, xaxis_tickangle=-45)
+                    return fig
+                show_chart('tab1', 'high_supply_bar', build_fig, len(high_supply), bar_limit)
         
-        high_supply = df_filtered[
-            df_filtered['tools_count'] >= 500
-        ].sort_values('tools_count', ascending=False)
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.markdown("##### 🔴 高竞争赛道列表")
-            st.dataframe(
-                high_supply[['category', 'chinese_name', 'tools_count', 'rank']],
-                hide_index=True,
-                use_container_width=True
-            )
-        
-        with col2:
-            fig = px.bar(
-                high_supply,
-                x='category',
-                y='tools_count',
-                color='tools_count',
-                color_continuous_scale='Reds',
-                title='高竞争赛道工具分布'
-            )
-            fig.update_layout(height=400, xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown(create_insight_card(
-            "💡 <b>观察:</b> 这些赛道工具数量多，竞争激烈。如需进入，建议寻找<b>细分定位</b>或<b>差异化功能</b>。",
-            "gold"
-        ), unsafe_allow_html=True)
+            st.markdown(create_insight_card(
+                "💡 <b>观察:</b> 这些赛道工具数量多，竞争激烈。如需进入，建议寻找<b>细分定位</b>或<b>差异化功能</b>。",
+                "gold"
+            ), unsafe_allow_html=True)
     
     with tab2:
-        st.markdown("#### 11️⃣ 低竞争赛道 (工具数<100)")
+        if tab_open(tab2):
+            st.markdown("#### 11️⃣ 低竞争赛道 (工具数<100)")
+        
+            st.info("💡 **说明**: 低竞争不等于高价值，需结合实际市场需求判断。工具少可能是需求小或市场未成熟。")
+        
+            low_supply = result['low_supply']
+        
+            col1, col2 = st.columns([1, 1])
+        
+            with col1:
+                st.markdown("##### 🔵 低竞争赛道列表")
+                st.dataframe(
+                    low_supply[['category', 'chinese_name', 'tools_count', 'rank', 'target_user']],
+                    hide_index=True,
+                    use_container_width=True
+                )
+        
+            with col2:
+                def build_fig():
+                    fig = px.scatter(
+                        downsample.density_sample(low_supply, 'rank', 'tools_count', point_limit, by='target_user'),
+                        x='rank',
+                        y='tools_count',
+                        color='target_user',
+                        hover_name='category',
+                        title='低竞争赛道分布'
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                show_chart('tab2', 'low_supply_scatter', build_fig, len(low_supply), point_limit)
         
-        st.info("💡 **说明**: 低竞争不等于高价值，需结合实际市场需求判断。工具少可能是需求小或市场未成熟。")
-        
-        low_supply = df_filtered[
-            df_filtered['tools_count'] < 100
-        ].sort_values('tools_count', ascending=True)
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.markdown("##### 🔵 低竞争赛道列表")
-            st.dataframe(
-                low_supply[['category', 'chinese_name', 'tools_count', 'rank', 'target_user']],
-                hide_index=True,
-                use_container_width=True
-            )
-        
-        with col2:
-            fig = px.scatter(
-                low_supply,
-                x='rank',
-                y='tools_count',
-                color='target_user',
-                hover_name='category',
-                title='低竞争赛道分布'
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown(create_insight_card(
-            "💡 <b>注意:</b> 这些赛道工具数量少，可能存在机会，但也需要验证市场需求是否真实存在。",
-            "success"
-        ), unsafe_allow_html=True)
+            st.markdown(create_insight_card(
+                "💡 <b>注意:</b> 这些赛道工具数量少，可能存在机会，但也需要验证市场需求是否真实存在。",
+                "success"
+            ), unsafe_allow_html=True)
     
     with tab3:
-        st.markdown("#### 12️⃣ 纵深与横切机会分析")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("##### 🔽 可纵深挖掘的赛道")
-            deep_dive = {
-                'Coding/Software': ['Debugging', 'Code review', 'Testing', 'Deployment', 'Documentation'],
-                'Marketing': ['SEO', 'Ads', 'Social media', 'Email marketing', 'Content marketing'],
-                'Education': ['K-12', 'Higher Ed', 'Corporate training', 'Language', 'Skills'],
-                'Health': ['Mental health', 'Fitness', 'Nutrition', 'Sleep', 'Chronic disease']
-            }
+        if tab_open(tab3):
+            st.markdown("#### 12️⃣ 纵深与横切机会分析")
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.markdown("##### 🔽 可纵深挖掘的赛道")
+                deep_dive = {
+                    'Coding/Software': ['Debugging', 'Code review', 'Testing', 'Deployment', 'Documentation'],
+                    'Marketing': ['SEO', 'Ads', 'Social media', 'Email marketing', 'Content marketing'],
+                    'Education': ['K-12', 'Higher Ed', 'Corporate training', 'Language', 'Skills'],
+                    'Health': ['Mental health', 'Fitness', 'Nutrition', 'Sleep', 'Chronic disease']
+                }
             
-            for parent, children in deep_dive.items():
-                st.markdown(f"**{parent}**")
-                st.markdown(f"→ {' | '.join(children)}")
-                st.markdown("")
-        
-        with col2:
-            st.markdown("##### ↔️ 可横向切分的赛道")
-            horizontal = {
-                'Business': ['管理', '战略', '发票', '合同', '提案', '会议'],
-                'Marketing': ['SEO', '广告', '文案', '社媒', '落地页', '邮件'],
-                'Design': ['Logo', 'UI/UX', '海报', '名片', '包装', '插画'],
-                'Personal': ['日程', '习惯', '记账', '健康', '社交', '学习']
-            }
+                for parent, children in deep_dive.items():
+                    st.markdown(f"**{parent}**")
+                    st.markdown(f"→ {' | '.join(children)}")
+                    st.markdown("")
+        
+            with col2:
+                st.markdown("##### ↔️ 可横向切分的赛道")
+                horizontal = {
+                    'Business': ['管理', '战略', '发票', '合同', '提案', '会议'],
+                    'Marketing': ['SEO', '广告', '文案', '社媒', '落地页', '邮件'],
+                    'Design': ['Logo', 'UI/UX', '海报', '名片', '包装', '插画'],
+                    'Personal': ['日程', '习惯', '记账', '健康', '社交', '学习']
+                }
             
-            for parent, children in horizontal.items():
-                st.markdown(f"**{parent}**")
-                st.markdown(f"→ {' | '.join(children)}")
-                st.markdown("")
+                for parent, children in horizontal.items():
+                    st.markdown(f"**{parent}**")
+                    st.markdown(f"→ {' | '.join(children)}")
+                    st.markdown("")
 
 # ============================================================================
 # 视图6: 分类系统视角
@@ -830,95 +930,81 @@ elif analysis_view == "🪜 产品机会视角":
 elif analysis_view == "🧱 分类系统视角":
     st.markdown('<h2 class="section-header">🧱 分类系统视角 - Taxonomy Insights</h2>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["🔄 分类冗余分析", "📏 颗粒度不一致", "🌐 超级领域合并"])
+    result = view_result('taxonomy')
+    
+    tab1, tab2, tab3 = view_tabs(["🔄 分类冗余分析", "📏 颗粒度不一致", "🌐 超级领域合并"])
     
     with tab1:
-        st.markdown("#### 14️⃣ 分类重叠/冗余分析")
-        
-        overlap_groups = {
-            '文本相关': ['Writing', 'Text', 'Content', 'Stories', 'Short stories', 'Copywriting'],
-            '教育相关': ['Education', 'Learning', 'Studying', 'School', 'School subject', 'Teaching'],
-            '图像相关': ['Images', 'Image editing', 'Anime image', 'Cartoon image', 'Photo editing', 'Portraits'],
-            '职业相关': ['Career', 'Job search', 'Resume', 'Job interview', 'Interview preparation'],
-            '健康相关': ['Health', 'Mental health', 'Fitness', 'Nutrition', 'Therapy', 'Meditation'],
-        }
-        
-        overlap_data = []
-        for group_name, categories in overlap_groups.items():
-            group_df = df_filtered[df_filtered['category'].isin(categories)]
-            overlap_data.append({
-                '重叠组': group_name,
-                '包含分类数': len(group_df),
-                '工具总数': group_df['tools_count'].sum(),
-                '包含分类': ', '.join(categories)
-            })
-        
-        overlap_df = pd.DataFrame(overlap_data)
-        st.dataframe(overlap_df, hide_index=True, use_container_width=True)
-        
-        st.markdown(create_insight_card(
-            "💡 <b>分类优化建议:</b> 当前分类存在明显重叠，建议合并相似分类，减少用户认知负担。例如将Writing/Text/Content合并为「文本创作」。",
-            "gold"
-        ), unsafe_allow_html=True)
+        if tab_open(tab1):
+            st.markdown("#### 14️⃣ 分类重叠/冗余分析")
+        
+            # 成员关系的分类对与去重工具数开销较大，只在本标签页打开时计算
+            with profiler.span('compute', 'taxonomy/overlap'):
+                overlap, overlap_pairs = analytics.taxonomy_overlap(
+                    processor, result['overlap'], selected_tiers, selected_scenarios)
+            st.dataframe(overlap, hide_index=True, use_container_width=True)
+
+            if overlap_pairs is not None:
+                st.markdown("##### 🔗 共享工具最多的分类对")
+                st.dataframe(overlap_pairs, hide_index=True, use_container_width=True)
+            else:
+                st.caption("「工具总数」为组内各分类工具数直接相加，多分类工具会被重复计数；"
+                           "由逐条工具记录构建并保留成员关系 (membership=True) 时可显示去重工具数与分类两两重叠 (Jaccard)。")
+
+            st.markdown(create_insight_card(
+                "💡 <b>分类优化建议:</b> 当前分类存在明显重叠，建议合并相似分类，减少用户认知负担。例如将Writing/Text/Content合并为「文本创作」。",
+                "gold"
+            ), unsafe_allow_html=True)
     
     with tab2:
-        st.markdown("#### 15️⃣ 分类颗粒度不一致")
+        if tab_open(tab2):
+            st.markdown("#### 15️⃣ 分类颗粒度不一致")
         
-        granularity_examples = df_filtered.groupby('granularity').apply(
-            lambda x: x.nlargest(3, 'tools_count')[['category', 'tools_count']].values.tolist()
-        ).to_dict()
+            col1, col2 = st.columns(2)
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("##### 🔵 颗粒度分布")
-            granularity_count = df_filtered['granularity'].value_counts().reset_index()
-            granularity_count.columns = ['颗粒度', '分类数']
+            with col1:
+                st.markdown("##### 🔵 颗粒度分布")
+                granularity_count = result['granularity_count']
             
-            fig = px.bar(
-                granularity_count,
-                x='颗粒度',
-                y='分类数',
-                color='颗粒度',
-                color_discrete_sequence=px.colors.sequential.Blues
-            )
-            fig.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("##### 📊 颗粒度对比")
-            comparison = df_filtered.groupby('granularity').agg({
-                'tools_count': ['mean', 'min', 'max', 'count']
-            }).round(0)
-            comparison.columns = ['平均工具数', '最少', '最多', '分类数']
-            st.dataframe(comparison, use_container_width=True)
+                def build_fig():
+                    fig = px.bar(
+                        granularity_count,
+                        x='颗粒度',
+                        y='分类数',
+                        color='颗粒度',
+                        color_discrete_sequence=px.colors.sequential.Blues
+                    )
+                    fig.update_layout(height=400, showlegend=False)
+                    return fig
+                show_chart('tab2', 'granularity_bar', build_fig)
+        
+            with col2:
+                st.markdown("##### 📊 颗粒度对比")
+                st.dataframe(result['granularity_comparison'], use_container_width=True)
     
     with tab3:
-        st.markdown("#### 16️⃣ 超级领域合并视图")
-        
-        super_domain_stats = df_filtered.groupby('super_domain').agg({
-            'tools_count': ['count', 'sum', 'mean']
-        }).round(0)
-        super_domain_stats.columns = ['子分类数', '工具总数', '平均工具数']
-        super_domain_stats = super_domain_stats.sort_values('工具总数', ascending=False).reset_index()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.treemap(
-                df_filtered,
-                path=['super_domain', 'category'],
-                values='tools_count',
-                color='tools_count',
-                color_continuous_scale='Blues',
-                title='超级领域树状图 (按工具数量)'
-            )
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("##### 📊 超级领域统计")
-            st.dataframe(super_domain_stats, hide_index=True, use_container_width=True)
+        if tab_open(tab3):
+            st.markdown("#### 16️⃣ 超级领域合并视图")
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                def build_fig():
+                    fig = px.treemap(
+                        df_filtered,
+                        path=['super_domain', 'category'],
+                        values='tools_count',
+                        color='tools_count',
+                        color_continuous_scale='Blues',
+                        title='超级领域树状图 (按工具数量)'
+                    )
+                    fig.update_layout(height=500)
+                    return fig
+                show_chart('tab3', 'super_domain_treemap', build_fig)
+        
+            with col2:
+                st.markdown("##### 📊 超级领域统计")
+                st.dataframe(result['super_domain_stats'], hide_index=True, use_container_width=True)
 
 # ============================================================================
 # 视图7: 商业化视角
@@ -928,92 +1014,92 @@ elif analysis_view == "🧲 商业化视角":
     
     st.warning("⚠️ **重要说明**: 本视角的分析基于分类名称推断目标用户类型，不代表实际付费能力或商业价值。准确的商业化分析需要真实的收入、转化率等数据支撑。")
     
-    tab1, tab2, tab3 = st.tabs(["👥 目标用户分析", "📊 商业模式分布", "🎯 变现策略参考"])
+    result = view_result('business')
+    
+    tab1, tab2, tab3 = view_tabs(["👥 目标用户分析", "📊 商业模式分布", "🎯 变现策略参考"])
     
     with tab1:
-        st.markdown("#### 17️⃣ 目标用户类型分析")
-        
-        st.info("💡 **说明**: 目标用户类型基于分类名称推断，B2B企业类通常付费意愿较高，B2C个人类通常更依赖免费增值模式。")
-        
-        target_user_stats = df_filtered.groupby('target_user').agg({
-            'tools_count': ['count', 'sum', 'mean']
-        }).round(0)
-        target_user_stats.columns = ['分类数', '工具总数', '平均工具数']
-        target_user_stats = target_user_stats.sort_values('工具总数', ascending=False).reset_index()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.pie(
-                target_user_stats,
-                values='工具总数',
-                names='target_user',
-                title='目标用户类型分布',
-                hole=0.3,
-                color_discrete_sequence=['#1E3A5F', '#3D7EAA', '#F39C12']
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.dataframe(target_user_stats, hide_index=True, use_container_width=True)
+        if tab_open(tab1):
+            st.markdown("#### 17️⃣ 目标用户类型分析")
+        
+            st.info("💡 **说明**: 目标用户类型基于分类名称推断，B2B企业类通常付费意愿较高，B2C个人类通常更依赖免费增值模式。")
+        
+            target_user_stats = result['target_user_stats']
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                def build_fig():
+                    fig = px.pie(
+                        target_user_stats,
+                        values='工具总数',
+                        names='target_user',
+                        title='目标用户类型分布',
+                        hole=0.3,
+                        color_discrete_sequence=['#1E3A5F', '#3D7EAA', '#F39C12']
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                show_chart('tab1', 'target_user_pie', build_fig)
+        
+            with col2:
+                st.dataframe(target_user_stats, hide_index=True, use_container_width=True)
             
-            st.markdown("##### 📋 各类型代表赛道")
-            for user_type in ['B2B企业', 'B2B/B2C', 'B2C个人']:
-                cats = df_filtered[df_filtered['target_user'] == user_type]['category'].head(5).tolist()
-                st.markdown(f"**{user_type}**: {', '.join(cats)}")
+                st.markdown("##### 📋 各类型代表赛道")
+                for user_type, cats in result['target_user_examples'].items():
+                    st.markdown(f"**{user_type}**: {', '.join(cats)}")
     
     with tab2:
-        st.markdown("#### 18️⃣ 商业模式分布 (推断)")
-        
-        st.info("💡 **说明**: 商业模式基于分类特征推断，实际模式可能因产品定位不同而异。")
-        
-        biz_model_stats = df_filtered.groupby('biz_model').agg({
-            'tools_count': ['count', 'sum', 'mean']
-        }).round(0)
-        biz_model_stats.columns = ['分类数', '工具总数', '平均工具数']
-        biz_model_stats = biz_model_stats.sort_values('工具总数', ascending=False).reset_index()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.pie(
-                biz_model_stats,
-                values='工具总数',
-                names='biz_model',
-                title='商业模式分布',
-                hole=0.3,
-                color_discrete_sequence=px.colors.qualitative.Set2
-            )
-            fig.update_layout(height=450)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.dataframe(biz_model_stats, hide_index=True, use_container_width=True)
+        if tab_open(tab2):
+            st.markdown("#### 18️⃣ 商业模式分布 (推断)")
+        
+            st.info("💡 **说明**: 商业模式基于分类特征推断，实际模式可能因产品定位不同而异。")
+        
+            biz_model_stats = result['biz_model_stats']
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                def build_fig():
+                    fig = px.pie(
+                        biz_model_stats,
+                        values='工具总数',
+                        names='biz_model',
+                        title='商业模式分布',
+                        hole=0.3,
+                        color_discrete_sequence=px.colors.qualitative.Set2
+                    )
+                    fig.update_layout(height=450)
+                    return fig
+                show_chart('tab2', 'biz_model_pie', build_fig)
+        
+            with col2:
+                st.dataframe(biz_model_stats, hide_index=True, use_container_width=True)
             
-            st.markdown("""
-            **商业模式说明:**
-            - **B2B SaaS**: 企业级订阅，高ARPU
-            - **B2B 订阅**: 中小企业营销工具
-            - **B2C 订阅**: 个人效率/学习工具
-            - **一次性/模板**: 设计资产付费
-            - **免费/流量**: 靠广告/流量变现
-            - **陪伴订阅**: 情感/社交类订阅
-            """)
+                st.markdown("""
+                **商业模式说明:**
+                - **B2B SaaS**: 企业级订阅，高ARPU
+                - **B2B 订阅**: 中小企业营销工具
+                - **B2C 订阅**: 个人效率/学习工具
+                - **一次性/模板**: 设计资产付费
+                - **免费/流量**: 靠广告/流量变现
+                - **陪伴订阅**: 情感/社交类订阅
+                """)
     
     with tab3:
-        st.markdown("#### 19️⃣ 变现策略建议矩阵")
-        
-        strategy_data = [
-            {'赛道类型': 'B2B SaaS', '代表赛道': 'Legal, Data analysis, HR', '建议定价': '$50-500/月', '关键成功因素': '深度集成、数据安全、客户成功'},
-            {'赛道类型': 'B2B 订阅', '代表赛道': 'SEO, Marketing, Ads', '建议定价': '$20-100/月', '关键成功因素': '效果可量化、易用性、模板丰富'},
-            {'赛道类型': 'B2C 订阅', '代表赛道': 'Learning, Productivity', '建议定价': '$5-30/月', '关键成功因素': '习惯养成、社交属性、免费增值'},
-            {'赛道类型': '一次性/模板', '代表赛道': 'Design, Logo, Resume', '建议定价': '$5-50/次', '关键成功因素': '质量、多样性、即时交付'},
-            {'赛道类型': '免费/流量', '代表赛道': 'Images, Games, Horoscope', '建议定价': '广告/增值', '关键成功因素': '用户量、使用频次、病毒传播'},
-            {'赛道类型': '陪伴订阅', '代表赛道': 'Virtual companion, Dating', '建议定价': '$10-50/月', '关键成功因素': '情感连接、个性化、隐私保护'},
-        ]
-        
-        st.dataframe(pd.DataFrame(strategy_data), hide_index=True, use_container_width=True)
+        if tab_open(tab3):
+            st.markdown("#### 19️⃣ 变现策略建议矩阵")
+        
+            strategy_data = [
+                {'赛道类型': 'B2B SaaS', '代表赛道': 'Legal, Data analysis, HR', '建议定价': '$50-500/月', '关键成功因素': '深度集成、数据安全、客户成功'},
+                {'赛道类型': 'B2B 订阅', '代表赛道': 'SEO, Marketing, Ads', '建议定价': '$20-100/月', '关键成功因素': '效果可量化、易用性、模板丰富'},
+                {'赛道类型': 'B2C 订阅', '代表赛道': 'Learning, Productivity', '建议定价': '$5-30/月', '关键成功因素': '习惯养成、社交属性、免费增值'},
+                {'赛道类型': '一次性/模板', '代表赛道': 'Design, Logo, Resume', '建议定价': '$5-50/次', '关键成功因素': '质量、多样性、即时交付'},
+                {'赛道类型': '免费/流量', '代表赛道': 'Images, Games, Horoscope', '建议定价': '广告/增值', '关键成功因素': '用户量、使用频次、病毒传播'},
+                {'赛道类型': '陪伴订阅', '代表赛道': 'Virtual companion, Dating', '建议定价': '$10-50/月', '关键成功因素': '情感连接、个性化、隐私保护'},
+            ]
+        
+            st.dataframe(pd.DataFrame(strategy_data), hide_index=True, use_container_width=True)
 
 # ============================================================================
 # 视图8: 用户角色视角
@@ -1021,94 +1107,83 @@ elif analysis_view == "🧲 商业化视角":
 elif analysis_view == "🧬 用户角色视角":
     st.markdown('<h2 class="section-header">🧬 用户角色视角 - Personas</h2>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["👔 工作角色", "🎭 兴趣角色", "💝 情感角色"])
+    result = view_result('personas')
+    
+    tab1, tab2, tab3 = view_tabs(["👔 工作角色", "🎭 兴趣角色", "💝 情感角色"])
     
     with tab1:
-        st.markdown("#### 21️⃣ 工作角色画像")
-        
-        work_personas = ['产品经理', '人力资源', '招聘专员', '数据分析师', '开发者', 
-                        '管理者', '销售', '营销人员', '设计师', '法务', '财务', '教师', '研究员', '客服']
-        
-        work_df = df_filtered[df_filtered['persona'].isin(work_personas)]
-        
-        persona_stats = work_df.groupby('persona').agg({
-            'tools_count': ['sum', 'mean'],
-            'category': 'count'
-        }).round(0)
-        persona_stats.columns = ['工具总数', '平均工具数', '相关分类数']
-        persona_stats = persona_stats.sort_values('工具总数', ascending=False).reset_index()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.bar(
-                persona_stats,
-                x='persona',
-                y='工具总数',
-                color='相关分类数',
-                color_continuous_scale='Blues',
-                title='工作角色AI工具分布'
-            )
-            fig.update_layout(height=400, xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.dataframe(persona_stats, hide_index=True, use_container_width=True)
+        if tab_open(tab1):
+            st.markdown("#### 21️⃣ 工作角色画像")
+        
+            persona_stats = result['work_persona_stats']
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                def build_fig():
+                    fig = px.bar(
+                        persona_stats,
+                        x='persona',
+                        y='工具总数',
+                        color='相关分类数',
+                        color_continuous_scale='Blues',
+                        title='工作角色AI工具分布'
+                    )
+                    fig.update_layout(height=400, xaxis_tickangle=-45)
+                    return fig
+                show_chart('tab1', 'work_persona_bar', build_fig)
+        
+            with col2:
+                st.dataframe(persona_stats, hide_index=True, use_container_width=True)
     
     with tab2:
-        st.markdown("#### 22️⃣ 兴趣角色画像")
-        
-        interest_personas = ['时尚爱好者', '美食爱好者', '品酒师', '宠物主人', 
-                            '旅行者', '游戏玩家', '音乐爱好者', '艺术爱好者', '健身达人']
-        
-        interest_df = df_filtered[df_filtered['persona'].isin(interest_personas)]
-        
-        if not interest_df.empty:
-            fig = px.treemap(
-                interest_df,
-                path=['persona', 'category'],
-                values='tools_count',
-                color='tools_count',
-                color_continuous_scale='Purples',
-                title='兴趣角色画像分布 (按工具数量)'
-            )
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("当前筛选条件下没有兴趣角色相关数据")
+        if tab_open(tab2):
+            st.markdown("#### 22️⃣ 兴趣角色画像")
+        
+            interest_df = result['interest_rows']
+        
+            if not interest_df.empty:
+                def build_fig():
+                    fig = px.treemap(
+                        interest_df,
+                        path=['persona', 'category'],
+                        values='tools_count',
+                        color='tools_count',
+                        color_continuous_scale='Purples',
+                        title='兴趣角色画像分布 (按工具数量)'
+                    )
+                    fig.update_layout(height=500)
+                    return fig
+                show_chart('tab2', 'interest_treemap', build_fig)
+            else:
+                st.info("当前筛选条件下没有兴趣角色相关数据")
     
     with tab3:
-        st.markdown("#### 23️⃣ 情感与学习角色")
+        if tab_open(tab3):
+            st.markdown("#### 23️⃣ 情感与学习角色")
         
-        col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
         
-        with col1:
-            st.markdown("##### 💝 情感需求角色")
-            emotional_categories = df_filtered[df_filtered['user_intent'] == '关系陪伴']
-            st.dataframe(
-                emotional_categories[['category', 'chinese_name', 'tools_count']],
-                hide_index=True,
-                use_container_width=True
-            )
+            with col1:
+                st.markdown("##### 💝 情感需求角色")
+                st.dataframe(result['emotional'], hide_index=True, use_container_width=True)
             
-            st.markdown(create_insight_card(
-                "💡 情感类AI适合做<b>陪伴订阅</b>模式，关键是建立情感连接和个性化体验",
-                "gold"
-            ), unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("##### 📚 技能学习角色")
-            learning_categories = df_filtered[df_filtered['user_intent'] == '技能学习']
-            st.dataframe(
-                learning_categories[['category', 'chinese_name', 'tools_count']],
-                hide_index=True,
-                use_container_width=True
-            )
+                st.markdown(create_insight_card(
+                    "💡 情感类AI适合做<b>陪伴订阅</b>模式，关键是建立情感连接和个性化体验",
+                    "gold"
+                ), unsafe_allow_html=True)
+        
+            with col2:
+                st.markdown("##### 📚 技能学习角色")
+                st.dataframe(result['learning'], hide_index=True, use_container_width=True)
             
-            st.markdown(create_insight_card(
-                "💡 学习类AI适合做<b>订阅+课程</b>模式，关键是学习效果可量化和习惯养成",
-                "success"
-            ), unsafe_allow_html=True)
+                st.markdown(create_insight_card(
+                    "💡 学习类AI适合做<b>订阅+课程</b>模式，关键是学习效果可量化和习惯养成",
+                    "success"
+                ), unsafe_allow_html=True)
+
+profiler.close('tab')
+profiler.close('view')
 
 # ============================================================================
 # 页脚
@@ -1121,3 +1196,34 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+profiler.end(analytics.view_id(analysis_view))
+
+# ============================================================================
+# 性能诊断 (隐藏面板)
+# ============================================================================
+if diagnostics is not None:
+    diagnostics.stop()
+    st.session_state.pop('_diagnostics', None)
+    with st.sidebar.expander("🩺 性能诊断", expanded=True):
+        st.caption(f"本次重跑 {diagnostics.seconds * 1000:.0f} ms，处理器阶段记录 {len(diagnostics.records)} 条")
+        table = diagnostics.summary()
+        table['wall_s'] = table['wall_s'] * 1000
+        table['cpu_s'] = table['cpu_s'] * 1000
+        table[['allocated_bytes', 'peak_bytes']] = table[['allocated_bytes', 'peak_bytes']] / 1024
+        table.columns = ['阶段', '调用次数', '耗时 (ms)', 'CPU (ms)', '净分配 (KB)', '峰值 (KB)', '行数']
+        st.dataframe(table.round(2), hide_index=True, use_container_width=True)
+        st.download_button(
+            "下载诊断报告 (JSON)",
+            json.dumps(diagnostics.as_dict(), ensure_ascii=False, default=str),
+            file_name="diagnostics.json",
+            mime="application/json"
+        )
+        
+        st.markdown(f"**重跑耗时** (本会话最近 {len(profiler.reruns)} 次，毫秒)")
+        st.dataframe(profiler.percentiles().round(1), hide_index=True, use_container_width=True)
+        st.markdown("**各片段耗时** (筛选 / 视图计算 / 标签页 / 图表)")
+        st.dataframe(
+            profiler.percentiles(by=('view', 'kind', 'name'), kinds=('filter', 'compute', 'tab', 'chart')).round(1),
+            hide_index=True,
+            use_container_width=True
+        )
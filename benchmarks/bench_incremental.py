@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试 - 工具数增量更新 (apply_count_deltas) vs 全量重算 (等价性见 tests/test_incremental.py)
+
+用法: python benchmarks/bench_incremental.py [--sizes 1000 100000 1000000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import AIToolsDataProcessor  # noqa: E402
+from data_sources import FrameDataSource  # noqa: E402
+
+# 计时时计算的数值派生列
+NUMERIC_COLUMNS = list(AIToolsDataProcessor.NUMERIC_DEPENDENCIES)
+BASE_COLUMNS = ['rank', 'category', 'tools_count', 'chinese_name']
+
+
+def synthetic_frame(n_rows, rng):
+    counts = np.sort(rng.zipf(1.3, n_rows).clip(max=20000) * 5)[::-1]
+    return pd.DataFrame({
+        'rank': np.arange(1, n_rows + 1),
+        'category': [f'cat-{i}' for i in range(n_rows)],
+        'tools_count': counts,
+        'chinese_name': [f'分类{i}' for i in range(n_rows)],
+    })
+
+
+def random_deltas(df, rng, batch):
+    rows = rng.choice(len(df), size=min(batch, len(df)), replace=False)
+    counts = df['tools_count'].to_numpy()[rows]
+    change = np.maximum(rng.integers(-50, 200, size=len(rows)), -counts)
+    return dict(zip(df['category'].to_numpy()[rows], change))
+
+
+def run(n_rows, batch, repeat=3, seed=0):
+    rng = np.random.default_rng(seed)
+    df = synthetic_frame(n_rows, rng)
+    processor = AIToolsDataProcessor(FrameDataSource(df))
+    processor.get_data(NUMERIC_COLUMNS)
+    processor.apply_count_deltas(random_deltas(processor.df, rng, 1))
+
+    incremental = float('inf')
+    for _ in range(repeat):
+        deltas = random_deltas(processor.df, rng, batch)
+        start = time.perf_counter()
+        processor.apply_count_deltas(deltas)
+        incremental = min(incremental, time.perf_counter() - start)
+
+    full = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        AIToolsDataProcessor(FrameDataSource(processor.df[BASE_COLUMNS])) \
+            .get_data(NUMERIC_COLUMNS)
+        full = min(full, time.perf_counter() - start)
+    return incremental, full
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--batch', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'incremental':>12} {'full':>9} {'speedup':>8}")
+    for n in args.sizes:
+        incremental, full = run(n, args.batch, args.repeat)
+        print(f"{n:>10,} | {incremental:>11.4f}s {full:>8.4f}s {full / incremental:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试 - 逐条工具记录聚合: 单进程流式 vs 多进程字节区间并行
+
+用法: python benchmarks/bench_ingestion.py [--records 2000000] [--format csv] [--workers 1 2 4 8]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_sources import DEFAULT_DATA_PATH  # noqa: E402
+from ingestion import aggregate_tool_records, IngestStats  # noqa: E402
+
+
+def write_dump(path, n_records, fmt, seed=0, block=100_000):
+    """生成合成工具记录 (每个工具 1-3 个分类，分类按 Zipf 分布)"""
+    rng = np.random.default_rng(seed)
+    categories = np.asarray(pd.read_csv(DEFAULT_DATA_PATH)['category'], dtype=object)
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == 'csv':
+            f.write('name,categories,launch_date,pricing\n')
+        for offset in range(0, n_records, block):
+            n = min(block, n_records - offset)
+            picks = rng.zipf(1.5, (n, 3)).clip(max=len(categories)) - 1
+            sizes = rng.integers(1, 4, n)
+            for i in range(n):
+                names = categories[picks[i, :sizes[i]]]
+                if fmt == 'csv':
+                    f.write(f'tool-{offset + i},"{"|".join(names)}",2025-01-01,Free\n')
+                else:
+                    quoted = ','.join(f'"{name}"' for name in names)
+                    f.write(f'{{"name": "tool-{offset + i}", "categories": [{quoted}], '
+                            f'"launch_date": "2025-01-01", "pricing": "Free"}}\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=2_000_000)
+    parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+    parser.add_argument('--workers', type=int, nargs='+', default=None)
+    args = parser.parse_args()
+    cores = os.cpu_count() or 1
+    workers = args.workers or sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f'tools.{args.format}')
+        write_dump(path, args.records, args.format)
+        print(f"{args.records:,} 条记录, {os.path.getsize(path) / 1e6:.0f} MB, {cores} 核")
+        print(f"{'workers':>8} | {'seconds':>8} {'rows/s':>12} {'speedup':>8}")
+        baseline, expected = None, None
+        for n in workers:
+            stats = IngestStats()
+            start = time.perf_counter()
+            result = aggregate_tool_records(path, workers=n, stats=stats)
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                baseline, expected = elapsed, result
+            assert result.equals(expected), f"workers={n} 的结果与单进程不一致"
+            print(f"{n:>8} | {elapsed:>7.2f}s {stats.rows_per_sec:>12,.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试 - 市场层级/竞争格局打标签: 逐行 apply vs 向量化分箱
+
+用法: python benchmarks/bench_labels.py [--sizes 10000 100000 1000000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import (  # noqa: E402
+    label_by_thresholds, TIER_THRESHOLDS, TIER_LABELS, QUADRANT_THRESHOLDS, QUADRANT_LABELS,
+)
+
+
+def legacy_tier(count):
+    if count >= 1000: return 'Tier 1 头部'
+    elif count >= 500: return 'Tier 2 腰部上'
+    elif count >= 200: return 'Tier 3 腰部'
+    elif count >= 100: return 'Tier 4 腰部下'
+    else: return 'Tier 5 尾部'
+
+
+def legacy_quadrant(row):
+    if row['tools_count'] >= 500:
+        return '红海赛道 (工具数≥500)'
+    elif row['tools_count'] >= 200:
+        return '竞争赛道 (200≤工具数<500)'
+    elif row['tools_count'] >= 100:
+        return '机会赛道 (100≤工具数<200)'
+    else:
+        return '蓝海赛道 (工具数<100)'
+
+
+def timed(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(n_rows, repeat=3, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'tools_count': rng.zipf(1.3, n_rows).clip(max=20000) * 10})
+    counts = df['tools_count']
+
+    old_tier, tier_old = timed(lambda: counts.apply(legacy_tier), 1 if n_rows > 100_000 else repeat)
+    new_tier, tier_new = timed(lambda: label_by_thresholds(counts, TIER_THRESHOLDS, TIER_LABELS), repeat)
+    old_quad, quad_old = timed(lambda: df.apply(legacy_quadrant, axis=1), 1 if n_rows > 100_000 else repeat)
+    new_quad, quad_new = timed(lambda: label_by_thresholds(counts, QUADRANT_THRESHOLDS, QUADRANT_LABELS), repeat)
+
+    assert (np.asarray(tier_new, dtype=object) == tier_old.to_numpy(dtype=object)).all()
+    assert (np.asarray(quad_new, dtype=object) == quad_old.to_numpy(dtype=object)).all()
+    return {
+        'rows': n_rows,
+        'tier_apply_s': old_tier, 'tier_binned_s': new_tier,
+        'quadrant_apply_s': old_quad, 'quadrant_binned_s': new_quad,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'tier apply':>11} {'binned':>9} {'speedup':>8} | "
+          f"{'quad apply':>11} {'binned':>9} {'speedup':>8}")
+    for n in args.sizes:
+        r = run(n, args.repeat)
+        print(f"{n:>10,} | {r['tier_apply_s']:>10.4f}s {r['tier_binned_s']:>8.4f}s "
+              f"{r['tier_apply_s'] / r['tier_binned_s']:>7.0f}x | "
+              f"{r['quadrant_apply_s']:>10.4f}s {r['quadrant_binned_s']:>8.4f}s "
+              f"{r['quadrant_apply_s'] / r['quadrant_binned_s']:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试 - 工具↔分类成员关系的分类两两重叠 (合成数据，默认 10M 工具 × 100k 分类)
+
+合成数据: 每个工具的分类数为 1 + Poisson(--mean-extra)，分类按 Zipf 流行度抽取。
+分别用 NumPy 实现与 scipy 稀疏矩阵乘积 (已安装时) 计算 AᵀA 的上三角，校验两者
+结果一致，并输出耗时与 tracemalloc 峰值内存；稠密矩阵所需内存仅作对比，不会分配。
+
+用法: python benchmarks/bench_membership.py [--tools 10000000] [--categories 100000] [--output result.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from membership import ToolMembership  # noqa: E402
+
+
+def synthetic_membership(n_tools, n_categories, mean_extra=1.5, zipf_s=1.1, seed=0):
+    """合成成员关系: 分类数 1 + Poisson，分类按 1/rank^s 的流行度抽取 (同一工具内去重)"""
+    rng = np.random.default_rng(seed)
+    degree = 1 + rng.poisson(mean_extra, n_tools)
+    weights = 1.0 / np.arange(1, n_categories + 1) ** zipf_s
+    cdf = np.cumsum(weights / weights.sum())
+    columns = np.minimum(np.searchsorted(cdf, rng.random(degree.sum())), n_categories - 1)
+    rows = np.repeat(np.arange(n_tools, dtype=np.int64), degree)
+    keys = np.unique(rows * n_categories + columns)
+    rows, columns = keys // n_categories, keys % n_categories
+    indptr = np.zeros(n_tools + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_tools), out=indptr[1:])
+    return ToolMembership(indptr, columns, [f'Category {i}' for i in range(n_categories)])
+
+
+def has_scipy():
+    try:
+        import scipy.sparse  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def timed(func):
+    """(结果, 耗时秒, tracemalloc 峰值字节)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+        return result, time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tools', type=int, default=10_000_000)
+    parser.add_argument('--categories', type=int, default=100_000)
+    parser.add_argument('--mean-extra', type=float, default=1.5, help='每个工具额外分类数的均值')
+    parser.add_argument('--output', default=None, help='写出 JSON 结果')
+    args = parser.parse_args()
+
+    membership = synthetic_membership(args.tools, args.categories, args.mean_extra)
+    csr_bytes = membership.indptr.nbytes + membership.indices.nbytes
+    report = {
+        'tools': membership.n_tools,
+        'categories': membership.n_categories,
+        'nnz': membership.nnz,
+        'csr_bytes': csr_bytes,
+        'dense_bytes': membership.n_categories ** 2 * 4,
+    }
+    print(f"{membership.n_tools:,} 工具 × {membership.n_categories:,} 分类, {membership.nnz:,} 个成员关系, "
+          f"CSR {csr_bytes / 1e6:.0f} MB (稠密 AᵀA 需 {report['dense_bytes'] / 1e9:.0f} GB)")
+
+    results = {}
+    methods = ['numpy'] + (['scipy'] if has_scipy() else [])
+    for method in methods:
+        compute = getattr(membership, f'_cooccurrence_{method}')
+        results[method], seconds, peak = timed(compute)
+        report[f'{method}_seconds'] = seconds
+        report[f'{method}_peak_bytes'] = peak
+        print(f"{method:<6} AᵀA 上三角: {len(results[method][0]):>12,} 个分类对 {seconds:>8.2f}s "
+              f"峰值 {peak / 1e6:>8.0f} MB")
+    if 'scipy' in results:
+        report['equal'] = all(np.array_equal(x, y) for x, y in zip(results['numpy'], results['scipy']))
+        print(f"NumPy 与 scipy 结果一致: {report['equal']}")
+    else:
+        print("未安装 scipy，只测量 NumPy 实现")
+
+    membership._cooccurrence = results['numpy']
+    _, report['pairs_top20_seconds'], _ = timed(lambda: membership.pairs(top=20))
+    groups = {'head': membership.categories[:10], 'tail': membership.categories[-10:]}
+    _, report['group_overlap_seconds'], _ = timed(lambda: membership.group_overlap(groups))
+    print(f"pairs(top=20) {report['pairs_top20_seconds']:.2f}s, "
+          f"group_overlap {report['group_overlap_seconds']:.2f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    sys.exit(0 if report.get('equal', True) else 1)
+
+
+if __name__ == '__main__':
+    main()
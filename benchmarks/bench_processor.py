@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试 - AIToolsDataProcessor 各阶段耗时与峰值内存 (合成数据, 1k/100k/1M 个分类)
+
+合成数据: tools_count 服从 Zipf 分布，随机抽取一部分已登记分类 (--coverage) 混入
+合成分类名，其余分类落入各维度的默认标签。结果输出为 JSON，可用 --compare
+与其他提交的结果对比。
+
+用法: python benchmarks/bench_processor.py [--sizes 1000 100000 1000000] [--repeat 3]
+                                           [--output result.json] [--compare baseline.json]
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import AIToolsDataProcessor  # noqa: E402
+from data_sources import CSVDataSource, FrameDataSource  # noqa: E402
+from taxonomy import load_taxonomy  # noqa: E402
+
+
+def synthetic_frame(n_categories, coverage=0.5, zipf_a=1.5, seed=0):
+    """合成分类表: Zipf 分布的 tools_count，coverage 比例的已登记分类随机分布在各排名上"""
+    rng = np.random.default_rng(seed)
+    known = load_taxonomy().categories.to_numpy(dtype=object)
+    n_known = min(int(len(known) * coverage), n_categories)
+    names = np.array([f'Synthetic {i}' for i in range(n_categories)], dtype=object)
+    names[rng.choice(n_categories, n_known, replace=False)] = rng.choice(known, n_known, replace=False)
+    counts = np.sort(rng.zipf(zipf_a, n_categories).clip(max=20000))[::-1]
+    return pd.DataFrame({
+        'rank': np.arange(1, n_categories + 1),
+        'category': names,
+        'tools_count': counts,
+        'chinese_name': names,
+    })
+
+
+def steps(processor):
+    """维度计算步骤: 分类体系编码 + 各派生列 (按依赖图中的顺序)"""
+    return ['_taxonomy_codes'] + processor.dimension_columns
+
+
+def measure(func, repeat, setup=None):
+    """最优耗时 (每次调用前执行 setup，不计入耗时)"""
+    best = float('inf')
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        func(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func, setup=None):
+    """tracemalloc 记录的峰值内存 (字节，单独运行一次，不影响计时)"""
+    state = setup() if setup else None
+    tracemalloc.start()
+    try:
+        func(state)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def stages(path):
+    """(阶段名, setup, func) 列表，setup 每次构造新的处理器以测量冷启动
+
+    load_data 从 CSV 文件读取；其余阶段的处理器由已读入的原始数据构造，
+    避免每次 setup 都重新解析文件。
+    """
+    raw = CSVDataSource(path).load()
+
+    def fresh():
+        return AIToolsDataProcessor(FrameDataSource(raw))
+
+    def from_file():
+        return AIToolsDataProcessor(CSVDataSource(path))
+
+    def with_dimensions():
+        processor = fresh()
+        processor.get_data()
+        return processor
+
+    def warmed():
+        processor = with_dimensions()
+        processor.get_market_structure_stats()
+        processor.get_blue_ocean_opportunities()
+        return processor
+
+    result = [('load_data', from_file, lambda p: p._load_data())]
+    for step in steps(fresh()):
+        def prepared(step=step):
+            processor = fresh()
+            processor.ensure(*processor.dependencies[step])
+            return processor
+        result.append((f'dimension:{step}', prepared, lambda p, step=step: p.ensure(step)))
+    result += [
+        ('add_analysis_dimensions', fresh, lambda p: p._add_analysis_dimensions()),
+        ('market_structure_stats', with_dimensions, lambda p: p.get_market_structure_stats()),
+        ('market_structure_stats_warm', warmed, lambda p: p.get_market_structure_stats()),
+        ('blue_ocean_top20', with_dimensions, lambda p: p.get_blue_ocean_opportunities(20)),
+        ('red_ocean_top20', with_dimensions, lambda p: p.get_red_ocean_warnings(20)),
+        ('top_k_warm', warmed, lambda p: p.get_red_ocean_warnings(20)),
+        ('top_k_filtered', warmed,
+         lambda p: p.top_k(20, 'tools_count', tiers=['Tier 3 腰部', 'Tier 4 腰部下'], scenarios=['工作'])),
+    ]
+    return result
+
+
+def run(n_categories, repeat=3, coverage=0.5, memory=True):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'categories.csv')
+        synthetic_frame(n_categories, coverage).to_csv(path, index=False)
+        rows = []
+        for name, setup, func in stages(path):
+            row = {'categories': n_categories, 'stage': name, 'seconds': measure(func, repeat, setup)}
+            if memory:
+                row['peak_bytes'] = peak_memory(func, setup)
+            rows.append(row)
+        return rows
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline_path, threshold=1.2, min_delta=0.001):
+    """与基线结果对比，变慢超过 threshold 倍且绝对差值超过 min_delta 秒的阶段计为回归"""
+    with open(baseline_path, encoding='utf-8') as f:
+        report = json.load(f)
+    baseline = {(r['categories'], r['stage']): r for r in report['results']}
+    print(f"\n对比基线 {baseline_path} (提交 {report['meta'].get('commit')}):")
+    regressions = 0
+    for row in results:
+        base = baseline.get((row['categories'], row['stage']))
+        if base is None or not base['seconds']:
+            continue
+        ratio = row['seconds'] / base['seconds']
+        slower = ratio > threshold and row['seconds'] - base['seconds'] > min_delta
+        flag = '  <-- 变慢' if slower else ''
+        regressions += bool(flag)
+        print(f"{row['categories']:>9,} {row['stage']:<34} {base['seconds'] * 1000:>9.2f}ms "
+              f"→ {row['seconds'] * 1000:>9.2f}ms {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--coverage', type=float, default=0.5, help='混入的已登记分类比例')
+    parser.add_argument('--no-memory', action='store_true', help='不测量峰值内存')
+    parser.add_argument('--output', default=None, help='写出 JSON 结果')
+    parser.add_argument('--compare', default=None, help='与之前输出的 JSON 结果对比')
+    parser.add_argument('--threshold', type=float, default=1.2, help='对比时判定为回归的耗时倍数')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'categories':>10} {'stage':<34} {'seconds':>10} {'peak MB':>9}")
+    for n in args.sizes:
+        for row in run(n, args.repeat, args.coverage, memory=not args.no_memory):
+            results.append(row)
+            peak = f"{row['peak_bytes'] / 1e6:>9.1f}" if 'peak_bytes' in row else f"{'-':>9}"
+            print(f"{n:>10,} {row['stage']:<34} {row['seconds']:>9.4f}s {peak}")
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'coverage': args.coverage,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.output}")
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试 - 仪表盘冷启动: app.py 顶层导入耗时预算 (-X importtime) 与首次运行耗时
+
+导入耗时只统计 app.py 在 streamlit 之外额外导入的模块 (streamlit 在服务进程
+启动时已导入)。超出 --budget-ms，或在启动时导入了应延迟导入的模块 (plotly)
+时以非零状态退出，可作为冷启动回归检查。
+
+用法: python benchmarks/bench_startup.py [--budget-ms 700] [--runs 3] [--app] [--output startup.json]
+"""
+
+import os
+import ast
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+# 应在首次使用时才导入的模块
+DEFERRED_MODULES = ['plotly.express', 'plotly.graph_objects', 'plotly.subplots']
+DEFAULT_BUDGET_MS = 700
+
+
+def app_imports(path=APP_PATH):
+    """app.py 模块顶层的 import 语句 (函数内的延迟导入不计)"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def importtime(code):
+    """在新进程中执行 code，返回 {模块: 自身导入耗时 (微秒)}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def import_cost(runs=3):
+    """app.py 顶层导入在 streamlit 之外的耗时，取多次运行中总耗时最小的一次"""
+    statements = app_imports()
+    best = None
+    for _ in range(runs):
+        baseline = importtime('import streamlit')
+        modules = importtime('\n'.join(statements))
+        extra = {name: us for name, us in modules.items() if name not in baseline}
+        if best is None or sum(extra.values()) < sum(best.values()):
+            best = extra
+    packages = {}
+    for name, us in best.items():
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + us
+    return {
+        'statements': statements,
+        'total_ms': sum(best.values()) / 1000,
+        'modules': len(best),
+        'packages_ms': {k: v / 1000 for k, v in sorted(packages.items(), key=lambda kv: -kv[1])},
+        'deferred_violations': [name for name in DEFERRED_MODULES if name in best],
+    }
+
+
+def first_run():
+    """AppTest 首次运行耗时: 无快照 (冷) 与已有列式快照 (热)"""
+    code = (
+        "import sys, time\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "at = AppTest.from_file(sys.argv[1], default_timeout=600)\n"
+        "start = time.perf_counter(); at.run()\n"
+        "assert not at.exception, at.exception\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, AI_TOOLS_BUNDLE_DIR=tmp)
+        for label in ('cold', 'warm'):
+            # 第一次运行写出快照，第二次运行 (新进程) 直接打开快照
+            result = subprocess.run([sys.executable, '-c', code, APP_PATH], cwd=ROOT, env=env,
+                                    capture_output=True, text=True, check=True)
+            timings[f'{label}_first_run_s'] = float(result.stdout.strip().splitlines()[-1])
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--app', action='store_true', help='同时测量 AppTest 首次运行耗时 (冷/热快照)')
+    parser.add_argument('--output', default=None, help='写出 JSON 结果')
+    args = parser.parse_args()
+
+    report = import_cost(args.runs)
+    print(f"app.py 顶层导入 (streamlit 之外): {report['total_ms']:.0f} ms, {report['modules']} 个模块, "
+          f"预算 {args.budget_ms:.0f} ms")
+    for package, ms in list(report['packages_ms'].items())[:10]:
+        print(f"  {package:<24} {ms:>8.1f} ms")
+    if args.app:
+        report.update(first_run())
+        print(f"首次运行: 冷启动 {report['cold_first_run_s']:.2f}s, 已有快照 {report['warm_first_run_s']:.2f}s")
+
+    report['budget_ms'] = args.budget_ms
+    report['ok'] = report['total_ms'] <= args.budget_ms and not report['deferred_violations']
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if report['deferred_violations']:
+        print(f"启动时导入了应延迟导入的模块: {', '.join(report['deferred_violations'])}")
+    if report['total_ms'] > args.budget_ms:
+        print(f"超出导入耗时预算 {report['total_ms'] - args.budget_ms:.0f} ms")
+    sys.exit(0 if report['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+集中度模块 - 基于排名顺序工具数前缀和的帕累托/头部占比查询
+"""
+
+import numpy as np
+
+
+class ConcentrationCurve:
+    """按排名排序的工具数前缀和
+
+    构建 O(n)，之后 Top-N 占比 O(1)、累计份额达到某比例所需的分类数 O(log n)。
+    """
+
+    def __init__(self, counts):
+        counts = np.asarray(counts)
+        dtype = np.int64 if np.issubdtype(counts.dtype, np.integer) else np.float64
+        self.prefix = np.cumsum(counts, dtype=dtype)
+        self.total = self.prefix[-1] if len(self.prefix) else 0
+
+    @classmethod
+    def from_prefix(cls, prefix):
+        """直接使用已有的前缀和 (不复制)"""
+        curve = cls.__new__(cls)
+        curve.prefix = prefix
+        curve.total = prefix[-1] if len(prefix) else 0
+        return curve
+
+    def __len__(self):
+        return len(self.prefix)
+
+    def top_n_share(self, n):
+        """前 n 个分类的工具占比 (%)"""
+        n = min(int(n), len(self.prefix))
+        if n <= 0 or not self.total:
+            return 0.0
+        return float(self.prefix[n - 1] / self.total * 100)
+
+    def cumulative_share(self):
+        """逐个分类的累计工具占比 (%)，用于绘制帕累托曲线"""
+        if not self.total:
+            return np.zeros(len(self.prefix))
+        return self.prefix / self.total * 100
+
+    def crossing_point(self, pct=80):
+        """累计占比首次达到 pct% 时的分类数 (从 1 计)，无数据时为 0"""
+        if not self.total:
+            return 0
+        target = self.total * pct / 100
+        return int(min(np.searchsorted(self.prefix, target, side='left') + 1, len(self.prefix)))
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+数据源模块 - 以列式方式加载分类统计数据 (CSV / Parquet / Arrow / 工具记录 JSONL)
+"""
+
+import os
+import json
+import hashlib
+import operator
+
+import pandas as pd
+import numpy as np
+
+# 处理器依赖的标准列
+STANDARD_COLUMNS = ['rank', 'category', 'tools_count', 'chinese_name']
+
+# 内置数据 (There's An AI For That, 2025-11-30 报告, 排名 1-150)
+DEFAULT_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'data', 'categories_2025-11-30.csv'
+)
+
+# 文件内容哈希缓存: (绝对路径, 大小, 修改时间) → sha256
+FILE_HASH_CACHE_SIZE = 64
+_FILE_HASHES = {}
+
+# 谓词下推支持的比较运算
+_FILTER_OPS = {
+    '==': operator.eq, '=': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+
+class DataSource:
+    """数据源基类
+
+    子类实现 `_read(columns)`，返回仅包含所需列的 DataFrame。
+    `columns` 为列投影 (None 表示全部标准列)，`filters` 为谓词列表，
+    形如 [('tools_count', '>=', 100), ('category', 'in', [...])]。
+    """
+
+    def __init__(self, columns=None, filters=None):
+        self.columns = list(columns) if columns is not None else None
+        self.filters = list(filters) if filters else []
+
+    def load(self):
+        """加载数据并规范化为处理器所需的格式"""
+        columns = self._projection()
+        df = self._read(columns)
+        df = self._apply_filters(df)
+        return _normalize(df, self.columns)
+
+    def fingerprint(self):
+        """数据内容指纹 (内容、投影或过滤条件变化时改变)"""
+        h = hashlib.sha256()
+        h.update(type(self).__name__.encode())
+        h.update(json.dumps([self.columns, self.filters], default=str).encode())
+        h.update(self._content_fingerprint().encode())
+        return h.hexdigest()
+
+    def _content_fingerprint(self):
+        raise NotImplementedError
+
+    def _projection(self):
+        """计算需要读取的列 (投影列 + 过滤列)"""
+        wanted = self.columns if self.columns is not None else STANDARD_COLUMNS
+        wanted = list(dict.fromkeys(list(wanted) + ['category', 'tools_count']))
+        for column, _, _ in self.filters:
+            if column not in wanted:
+                wanted.append(column)
+        return wanted
+
+    def _read(self, columns):
+        raise NotImplementedError
+
+    def _apply_filters(self, df):
+        """在内存中应用过滤条件 (不支持下推的格式使用)"""
+        if not self.filters or df.empty:
+            return df
+        mask = np.ones(len(df), dtype=bool)
+        for column, op, value in self.filters:
+            mask &= _filter_mask(df[column], op, value)
+        return df[mask]
+
+
+class FrameDataSource(DataSource):
+    """内存中的 DataFrame 数据源 (基准测试、增量更新后重建等场景)"""
+
+    def __init__(self, df, columns=None, filters=None):
+        super().__init__(columns, filters)
+        self.df = df
+
+    def _content_fingerprint(self):
+        hashed = pd.util.hash_pandas_object(self.df, index=False).to_numpy()
+        return hashlib.sha256(hashed.tobytes()).hexdigest()
+
+    def _read(self, columns):
+        return self.df[[c for c in columns if c in self.df.columns]]
+
+
+class FileDataSource(DataSource):
+    """基于单个文件的数据源，内容哈希按 (路径, 大小, 修改时间) 在进程内缓存
+
+    缓存不随实例保存，每次重跑新建的数据源实例同样命中，文件未变化时不重新哈希。
+    """
+
+    def __init__(self, path, columns=None, filters=None):
+        super().__init__(columns, filters)
+        self.path = path
+
+    def _content_fingerprint(self):
+        stat = os.stat(self.path)
+        state = (os.path.abspath(self.path), stat.st_size, stat.st_mtime_ns)
+        digest = _FILE_HASHES.get(state)
+        if digest is None:
+            digest = _file_sha256(self.path)
+            _FILE_HASHES[state] = digest
+            while len(_FILE_HASHES) > FILE_HASH_CACHE_SIZE:
+                _FILE_HASHES.pop(next(iter(_FILE_HASHES)), None)
+        return digest
+
+
+class CSVDataSource(FileDataSource):
+    """CSV 文件数据源 (usecols 列投影 + 向量化过滤)"""
+
+    def __init__(self, path, columns=None, filters=None, **read_kwargs):
+        super().__init__(path, columns, filters)
+        self.read_kwargs = read_kwargs
+
+    def _read(self, columns):
+        header = pd.read_csv(self.path, nrows=0, **self.read_kwargs).columns
+        usecols = [c for c in columns if c in header]
+        return pd.read_csv(self.path, usecols=usecols, **self.read_kwargs)
+
+
+class ParquetDataSource(FileDataSource):
+    """Parquet 数据源 (列投影与谓词下推由 pyarrow 完成)"""
+
+    file_format = 'parquet'
+
+    def _read(self, columns):
+        ds = _require_pyarrow()
+        dataset = ds.dataset(self.path, format=self.file_format)
+        available = set(dataset.schema.names)
+        table = dataset.to_table(
+            columns=[c for c in columns if c in available],
+            filter=_arrow_expression(self.filters),
+        )
+        return table.to_pandas()
+
+    def _apply_filters(self, df):
+        # 过滤已在读取阶段下推
+        return df
+
+
+class ArrowDataSource(ParquetDataSource):
+    """Arrow IPC / Feather 数据源"""
+
+    file_format = 'ipc'
+
+
+def open_data_source(path=None, columns=None, filters=None):
+    """根据文件扩展名创建数据源，未指定路径时使用内置数据"""
+    if path is None:
+        path = DEFAULT_DATA_PATH
+    lower = str(path).lower()
+    if lower.endswith(('.parquet', '.pq')):
+        return ParquetDataSource(path, columns, filters)
+    if lower.endswith(('.arrow', '.feather', '.ipc')):
+        return ArrowDataSource(path, columns, filters)
+    if lower.endswith(('.jsonl', '.ndjson', '.jsonl.gz', '.ndjson.gz')):
+        # 逐条工具记录，加载时流式聚合
+        from ingestion import ToolRecordsSource
+        return ToolRecordsSource(path, columns, filters)
+    if lower.endswith(('.csv', '.csv.gz', '.tsv')):
+        kwargs = {'sep': '\t'} if lower.endswith('.tsv') else {}
+        return CSVDataSource(path, columns, filters, **kwargs)
+    raise ValueError(f"不支持的数据文件格式: {path}")
+
+
+def _normalize(df, columns=None):
+    """补齐缺失的标准列并按排名排序"""
+    df = df.reset_index(drop=True)
+    if 'rank' not in df.columns:
+        df['rank'] = df['tools_count'].rank(method='first', ascending=False).astype('int64')
+    if 'chinese_name' not in df.columns:
+        df['chinese_name'] = df['category']
+    df = df.sort_values('rank', kind='stable').reset_index(drop=True)
+    ordered = [c for c in STANDARD_COLUMNS if c in df.columns]
+    extra = [c for c in (columns or []) if c not in ordered and c in df.columns]
+    return df[ordered + extra]
+
+
+def _filter_mask(series, op, value):
+    """单个过滤条件的布尔掩码"""
+    if op == 'in':
+        return series.isin(value).to_numpy()
+    if op in ('not in', 'not_in'):
+        return ~series.isin(value).to_numpy()
+    if op not in _FILTER_OPS:
+        raise ValueError(f"不支持的过滤运算: {op}")
+    return _FILTER_OPS[op](series, value).to_numpy()
+
+
+def _arrow_expression(filters):
+    """将过滤条件列表转换为 pyarrow 表达式"""
+    if not filters:
+        return None
+    import pyarrow.dataset as ds
+
+    expression = None
+    for column, op, value in filters:
+        field = ds.field(column)
+        if op == 'in':
+            term = field.isin(list(value))
+        elif op in ('not in', 'not_in'):
+            term = ~field.isin(list(value))
+        elif op in _FILTER_OPS:
+            term = _FILTER_OPS[op](field, value)
+        else:
+            raise ValueError(f"不支持的过滤运算: {op}")
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def _file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow.dataset as ds
+    except ImportError as exc:
+        raise ImportError("读取 Parquet/Arrow 数据需要安装 pyarrow: pip install pyarrow") from exc
+    return ds
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+降采样模块 - 大数据量图表在服务端先降采样再绘制，限制每个图表发送到浏览器的点数
+
+- 曲线: LTTB (Largest-Triangle-Three-Buckets)，保留形状的拐点与首尾
+- 散点: 按屏幕网格分箱，每个 (网格, 颜色分组) 保留一个代表点，保留分布轮廓与离群点
+- 柱状图: 只保留数值最大的若干根柱子
+
+max_points 为 None 时原样返回 (全分辨率)。
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_POINTS = 2000
+DEFAULT_MAX_BARS = 100
+
+
+def lttb(x, y, threshold):
+    """LTTB 降采样，返回保留点的下标 (升序，包含首尾)"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold is None or threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # 中间 n-2 个点均分到 threshold-2 个桶，首尾各自单独成桶
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    mean_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / np.diff(edges), x[-1])
+    mean_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / np.diff(edges), y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 与上一个选中点、下一个桶均值组成的三角形面积最大的点
+        area = np.abs((x[a] - mean_x[i + 1]) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (mean_y[i + 1] - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_curve(df, x, y, max_points=DEFAULT_MAX_POINTS):
+    """曲线降采样 (df 需已按 x 排序)"""
+    if max_points is None or len(df) <= max_points:
+        return df
+    return df.iloc[lttb(df[x].to_numpy(), df[y].to_numpy(), max_points)]
+
+
+def _grid(values, bins, log):
+    """数值 → 网格坐标 (0..bins-1)"""
+    values = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    if log:
+        values = np.log10(np.where(values > 0, values, np.nan))
+    low, high = np.nanmin(values), np.nanmax(values)
+    span = high - low if high > low else 1.0
+    cells = np.floor((np.nan_to_num(values, nan=low) - low) / span * bins)
+    return np.clip(cells, 0, bins - 1).astype(np.int64)
+
+
+def density_sample(df, x, y, max_points=DEFAULT_MAX_POINTS, by=None, log_x=False, log_y=False):
+    """散点图密度分箱: 每个 (网格, 颜色分组) 保留第一个点，结果不超过 max_points 个点
+
+    网格按坐标轴的刻度 (线性/对数) 划分，与图上的像素分布一致。
+    """
+    if max_points is None or len(df) <= max_points:
+        return df
+    groups = df[by].nunique(dropna=False) if by else 1
+    bins = max(int(np.sqrt(max_points / max(groups, 1))), 1)
+    cell = _grid(df[x], bins, log_x) * bins + _grid(df[y], bins, log_y)
+    keys = pd.DataFrame({'cell': cell})
+    if by:
+        keys['group'] = pd.factorize(df[by], use_na_sentinel=False)[0]
+    return df[~keys.duplicated().to_numpy()]
+
+
+def top_bars(df, column, max_bars=DEFAULT_MAX_BARS):
+    """柱状图只保留 column 最大的 max_bars 根柱子 (保持原有顺序)"""
+    if max_bars is None or len(df) <= max_bars:
+        return df
+    keep = np.sort(np.argsort(-df[column].to_numpy(), kind='stable')[:max_bars])
+    return df.iloc[keep]
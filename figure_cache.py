@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+图表缓存模块 - 按 (视图, 标签页, 图表, 筛选条件, 数据版本) 缓存 Plotly 图表的 JSON，LRU 淘汰
+
+构建 plotly.express 图表 (尤其是树状图/旭日图) 需要上百毫秒，而从 JSON 还原
+只需十几毫秒；缓存 JSON 字符串而不是 Figure 对象，各会话拿到的是独立副本。
+"""
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def figure_key(view, tab, name, selection, version):
+    """缓存键: 筛选条件按规范化 JSON 取哈希"""
+    payload = json.dumps(selection, ensure_ascii=False)
+    return (view, tab, name, hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24], version)
+
+
+class FigureCache:
+    """图表 JSON 的 LRU 缓存 (线程安全，可在所有会话间共享)
+
+    按条目数和 JSON 总字节数两个上限淘汰最久未使用的图表。
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, max_bytes=DEFAULT_MAX_BYTES):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._specs = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """还原缓存的图表，未命中时返回 None"""
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is None:
+                self.misses += 1
+                return None
+            self._specs.move_to_end(key)
+            self.hits += 1
+        # plotly 在第一次用到图表时才导入
+        import plotly.graph_objects as go
+        return go.Figure(json.loads(spec))
+
+    def put(self, key, figure):
+        import plotly.io as pio
+        spec = pio.to_json(figure, validate=False)
+        with self._lock:
+            old = self._specs.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._specs[key] = spec
+            self._bytes += len(spec)
+            while self._specs and (len(self._specs) > self.maxsize or self._bytes > self.max_bytes):
+                _, evicted = self._specs.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def figure(self, key, build):
+        """命中时还原缓存的图表，否则调用 build() 构建并写入缓存"""
+        figure = self.get(key)
+        if figure is None:
+            figure = build()
+            self.put(key, figure)
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """命中率与占用统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'size': len(self._specs),
+                'bytes': self._bytes,
+            }
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+筛选索引模块 - 侧边栏筛选维度的预计算位图索引
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    """单列位图索引: 每个取值对应一个按位压缩 (np.packbits) 的行位图"""
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(pd.Series(values), sort=False)
+        self.n_rows = len(codes)
+        self.values = list(uniques)
+        self.bitmaps = {
+            value: np.packbits(codes == code) for code, value in enumerate(self.values)
+        }
+        self._all = np.packbits(np.ones(self.n_rows, dtype=bool))
+        self._none = np.zeros_like(self._all)
+
+    def bits(self, selected=None):
+        """选中取值位图的按位 OR，selected 为 None 表示不过滤"""
+        if selected is None:
+            return self._all
+        bitmaps = [self.bitmaps[v] for v in selected if v in self.bitmaps]
+        if not bitmaps:
+            return self._none
+        if len(bitmaps) == 1:
+            return bitmaps[0]
+        return np.bitwise_or.reduce(bitmaps)
+
+    def count(self, value):
+        """某取值的行数"""
+        bitmap = self.bitmaps.get(value)
+        return 0 if bitmap is None else int(np.unpackbits(bitmap, count=self.n_rows).sum())
+
+
+class FilterIndex:
+    """多列筛选索引: 列内 OR、列间 AND"""
+
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self.indexes = {column: BitmapIndex(df[column]) for column in columns}
+
+    def mask(self, **selections):
+        """返回布尔行掩码，未给出或为 None 的列不参与过滤"""
+        bits = None
+        for column, selected in selections.items():
+            if selected is None:
+                continue
+            column_bits = self.indexes[column].bits(selected)
+            bits = column_bits if bits is None else np.bitwise_and(bits, column_bits)
+        if bits is None:
+            return np.ones(self.n_rows, dtype=bool)
+        return np.unpackbits(bits, count=self.n_rows).view(bool)
+
+    def is_unfiltered(self, **selections):
+        """所有选中项都覆盖了全部取值时无需过滤"""
+        for column, selected in selections.items():
+            if selected is None:
+                continue
+            if not set(self.indexes[column].values) <= set(selected):
+                return False
+        return True
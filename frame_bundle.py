@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+列式快照模块 - 将处理后的 DataFrame 按列写成 .npy 文件，其他进程以内存映射方式零拷贝打开
+"""
+
+import os
+import json
+import uuid
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from data_sources import DataSource
+
+BUNDLE_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+MEMBERSHIP_DIR = 'membership'
+
+
+def _codes_dtype(n_categories):
+    """与 pandas Categorical 内部编码相同的整数位宽 (位宽一致时打开快照不复制编码)"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def save_bundle(df, path, metadata=None, membership=None):
+    """写出列式快照目录: 每列一个 .npy 文件 + manifest.json
+
+    数值/布尔列原样保存；Categorical 列保存编码，文本列按字典序编码为有序
+    Categorical (编码可内存映射，字符串只存在清单中)。先写入临时目录再
+    改名，多个进程同时写同一路径时保留先完成的一份。membership (工具→分类
+    成员关系) 写在 membership/ 子目录中。
+    """
+    tmp = f"{path}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    os.makedirs(tmp)
+    try:
+        columns = []
+        for i, (name, series) in enumerate(df.items()):
+            entry = {'name': name, 'file': f'{i:03d}.npy'}
+            dtype = series.dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                values = series.cat.codes.to_numpy()
+                entry.update(kind='categorical', categories=dtype.categories.tolist(), ordered=bool(dtype.ordered))
+            elif isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+                values = series.to_numpy()
+                entry.update(kind='numeric')
+            else:
+                codes, uniques = pd.factorize(series, sort=True)
+                values = codes.astype(_codes_dtype(len(uniques)))
+                entry.update(kind='categorical', categories=uniques.tolist(), ordered=True)
+            np.save(os.path.join(tmp, entry['file']), np.ascontiguousarray(values))
+            columns.append(entry)
+        manifest = dict(metadata or {}, version=BUNDLE_VERSION, rows=len(df), columns=columns)
+        if membership is not None:
+            membership.save(os.path.join(tmp, MEMBERSHIP_DIR))
+            manifest['membership'] = MEMBERSHIP_DIR
+        with open(os.path.join(tmp, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            if not os.path.exists(os.path.join(path, MANIFEST_NAME)):
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return path
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_NAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != BUNDLE_VERSION:
+        raise ValueError(f"不支持的列式快照版本: {manifest.get('version')}")
+    return manifest
+
+
+def load_bundle(path, columns=None):
+    """以内存映射方式打开列式快照，返回 (DataFrame, manifest)
+
+    各列直接引用映射的只读页面，不复制数据 (Categorical 列直接以映射的编码
+    构造，不再校验与转换位宽)；多个进程打开同一快照时共享操作系统页缓存。
+    旧版快照中位宽与 pandas 不一致的编码列在打开时会被转换 (复制) 一次。
+    """
+    manifest = read_manifest(path)
+    data = {}
+    for entry in manifest['columns']:
+        if columns is not None and entry['name'] not in columns:
+            continue
+        values = np.load(os.path.join(path, entry['file']), mmap_mode='r')
+        if entry['kind'] == 'categorical':
+            dtype = pd.CategoricalDtype(entry['categories'], ordered=entry['ordered'])
+            values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        data[entry['name']] = pd.Series(values, copy=False)
+    return pd.DataFrame(data, copy=False), manifest
+
+
+class BundleSource(DataSource):
+    """列式快照数据源 (已包含计算好的派生列，按保存时的格式原样返回)"""
+
+    def __init__(self, path, columns=None):
+        super().__init__(columns)
+        self.path = path
+        self.manifest = read_manifest(path)
+        self.membership = None
+
+    def fingerprint(self):
+        # 快照与其来源数据内容相同，沿用来源数据源的指纹
+        return self.manifest.get('source', '')
+
+    def load(self):
+        if self.manifest.get('membership'):
+            from membership import ToolMembership
+            self.membership = ToolMembership.load(os.path.join(self.path, self.manifest['membership']))
+        return load_bundle(self.path, self.columns)[0]
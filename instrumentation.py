@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+性能诊断模块 - 按阶段记录墙钟时间、CPU 时间、内存分配与行数
+
+默认关闭，未开启时每个埋点只多一次判断。两种开启方式:
+
+- `with profile(memory=True) as report:` 记录当前线程内执行的阶段
+- `add_hook(callback)`: 任意线程中每个阶段结束时回调 callback(record)，用于日志/监控
+
+内存分配基于 tracemalloc (profile(memory=True) 时自动开启)；tracemalloc 是进程级
+统计，会拖慢所有线程，多线程同时执行时各阶段的内存数字也会互相影响。同时进行
+的多个记录按引用计数共用追踪，最后一个结束时才停止，且不会停止外部开启的追踪。
+"""
+
+import time
+import functools
+import threading
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+_hooks = []
+_local = threading.local()
+# 需要内存统计的进行中记录数，以及 tracemalloc 是否由这些记录开启
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def add_hook(callback):
+    """注册阶段结束回调 callback(record)"""
+    _hooks.append(callback)
+    return callback
+
+
+def remove_hook(callback):
+    if callback in _hooks:
+        _hooks.remove(callback)
+
+
+def enabled():
+    """当前线程是否有记录者 (profile 或回调)"""
+    return bool(_hooks) or bool(getattr(_local, 'reports', None))
+
+
+def _emit(record):
+    for report in getattr(_local, 'reports', ()):
+        report.records.append(record)
+    for hook in list(_hooks):
+        hook(record)
+
+
+def _row_count(result):
+    if isinstance(result, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(result)
+    return None
+
+
+class _NullStage:
+    """未开启诊断时的空阶段"""
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """一个被计时的阶段 (可嵌套，depth 为嵌套层数)"""
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault('stack', [])
+        self.depth = len(stack)
+        self.memory = tracemalloc.is_tracing()
+        if self.memory:
+            # 峰值计数器是全局的: 进入子阶段前把已观察到的峰值记到父阶段，再重置
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.start_bytes = self.peak = current
+        stack.append(self)
+        self.cpu = time.thread_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        stack = _local.stack
+        stack.pop()
+        record = {
+            'stage': self.name,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'allocated_bytes': None,
+            'peak_bytes': None,
+            'rows': self.rows,
+            'depth': self.depth,
+            'thread': threading.current_thread().name,
+            'error': exc_type.__name__ if exc_type else None,
+        }
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, peak)
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+            record['allocated_bytes'] = current - self.start_bytes
+            record['peak_bytes'] = self.peak - self.start_bytes
+        _emit(record)
+        return False
+
+
+def stage(name, rows=None):
+    """阶段计时上下文: `with stage('dimension:market_tier', rows=n) as s:`，可在块内设置 s.rows"""
+    if not enabled():
+        return _NULL_STAGE
+    return _Stage(name, rows)
+
+
+def instrumented(func=None, *, name=None):
+    """方法/函数埋点装饰器，返回 DataFrame/Series/数组时记录行数"""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return func(*args, **kwargs)
+            with _Stage(label) as current:
+                result = func(*args, **kwargs)
+                current.rows = _row_count(result)
+            return result
+        return wrapper
+    return decorate(func) if func is not None else decorate
+
+
+class Report:
+    """一次诊断的阶段记录 (按结束顺序)"""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = []
+        self.seconds = None
+        self._started_tracing = False
+        self._start = None
+        self._reports = None
+
+    def start(self):
+        if self.memory:
+            _acquire_tracing()
+            self._started_tracing = True
+        self._reports = _local.__dict__.setdefault('reports', [])
+        self._reports.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        """停止记录 (可重复调用，已停止时不做任何事)"""
+        if self._reports is None:
+            return self
+        self.seconds = time.perf_counter() - self._start
+        if self in self._reports:
+            self._reports.remove(self)
+        self._reports = None
+        if self._started_tracing:
+            _release_tracing()
+            self._started_tracing = False
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def summary(self):
+        """按阶段汇总: 调用次数、总耗时、CPU 时间、净分配、峰值与行数 (按总耗时降序)"""
+        columns = ['stage', 'calls', 'wall_s', 'cpu_s', 'allocated_bytes', 'peak_bytes', 'rows']
+        if not self.records:
+            return pd.DataFrame(columns=columns)
+        df = pd.DataFrame(self.records)
+        summary = df.groupby('stage', sort=False).agg(
+            calls=('wall_s', 'size'),
+            wall_s=('wall_s', 'sum'),
+            cpu_s=('cpu_s', 'sum'),
+            allocated_bytes=('allocated_bytes', 'sum'),
+            peak_bytes=('peak_bytes', 'max'),
+            rows=('rows', 'max'),
+        ).reset_index()
+        if not self.memory:
+            summary[['allocated_bytes', 'peak_bytes']] = None
+        return summary.sort_values('wall_s', ascending=False, kind='stable')[columns].reset_index(drop=True)
+
+    def as_dict(self):
+        """结构化报告 (可直接 json.dump)"""
+        summary = self.summary().astype(object)
+        return {
+            'seconds': self.seconds,
+            'memory': self.memory,
+            'records': list(self.records),
+            'summary': summary.where(summary.notna(), None).to_dict('records'),
+        }
+
+
+def _acquire_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _release_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+def profile(memory=False):
+    """记录当前线程内各阶段: `with profile(memory=True) as report: ...`"""
+    return Report(memory)
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+成员关系模块 - 工具↔分类多对多关系的 CSR 稀疏矩阵 (行=工具, 列=分类)，计算分类两两重叠
+
+分类两两共享的工具数即 AᵀA 的非对角元素。默认用 NumPy 按工具枚举分类对后
+排序计数 (计算量与稀疏矩阵乘积相同，10M 工具 × 100k 分类时比 scipy 的 AᵀA
+快约 3 倍)；method='scipy' 时直接计算稀疏矩阵乘积 (需要安装 scipy)。两者都
+不构造稠密矩阵，内存只与非零元素数和实际共现的分类对数有关。
+"""
+
+import os
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ingestion import (DEFAULT_CHUNK_SIZE, DEFAULT_SEPARATOR, IngestStats, explode_memberships,
+                       iter_record_chunks, split_byte_ranges)
+
+# NumPy 实现中每块枚举的分类对数上限 (控制临时数组大小)
+PAIR_BLOCK_SIZE = 4_000_000
+
+
+def _require_scipy():
+    try:
+        import scipy.sparse as sparse
+    except ImportError as exc:
+        raise ImportError("稀疏矩阵乘积需要安装 scipy: pip install scipy") from exc
+    return sparse
+
+
+class ToolMembership:
+    """工具→分类成员关系 (CSR: indptr/indices，列号对应 categories)
+
+    同一工具的分类不重复。数组可以是内存映射的只读数组 (见 load)。
+    """
+
+    def __init__(self, indptr, indices, categories):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.categories = pd.Index(categories, dtype=object)
+        self._cooccurrence = None
+        self._counts = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'indptr': self.indptr, 'indices': self.indices, 'categories': self.categories}
+
+    def __setstate__(self, state):
+        self.__init__(state['indptr'], state['indices'], state['categories'])
+
+    @property
+    def n_tools(self):
+        return len(self.indptr) - 1
+
+    @property
+    def n_categories(self):
+        return len(self.categories)
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    @classmethod
+    def from_lists(cls, memberships):
+        """由每个工具的分类名列表构建 (小规模数据、测试用)"""
+        codes = {}
+        indptr = [0]
+        indices = []
+        for names in memberships:
+            row = {codes.setdefault(name, len(codes)) for name in names}
+            indices.extend(sorted(row))
+            indptr.append(len(indices))
+        return cls(indptr, indices, list(codes))
+
+    @classmethod
+    def from_chunks(cls, chunks, separator=DEFAULT_SEPARATOR, stats=None):
+        """消费分类列块构建 (每块按块内去重的分类名编码，再映射到全局列号)"""
+        codes = {}
+        lengths = []
+        parts = []
+        for categories in chunks:
+            pairs = explode_memberships(categories, separator)
+            local, uniques = pd.factorize(pairs['category'])
+            mapping = np.fromiter((codes.setdefault(name, len(codes)) for name in uniques),
+                                  dtype=np.int32, count=len(uniques))
+            parts.append(mapping[local])
+            lengths.append(np.bincount(pairs['record'].to_numpy(), minlength=len(categories)))
+            if stats is not None:
+                stats.records += len(categories)
+                stats.category_rows += len(pairs)
+                stats.chunks += 1
+        indptr = np.zeros(sum(len(x) for x in lengths) + 1, dtype=np.int64)
+        if lengths:
+            np.cumsum(np.concatenate(lengths), out=indptr[1:])
+        indices = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+        return cls(indptr, indices, list(codes))
+
+    @classmethod
+    def from_records(cls, path, chunk_size=DEFAULT_CHUNK_SIZE, separator=DEFAULT_SEPARATOR, stats=None,
+                     workers=1):
+        """流式读取工具记录文件构建，行顺序与文件中的记录顺序一致
+
+        workers > 1 时与 aggregate_tool_records 相同按字节区间在进程池中分别
+        构建，再按区间顺序拼接。
+        """
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        if workers > 1 and not str(path).lower().endswith('.gz'):
+            ranges = split_byte_ranges(path, workers * 4)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                tasks = [pool.submit(_membership_range, path, r, chunk_size, separator) for r in ranges]
+                parts = []
+                for task in tasks:
+                    part, part_stats = task.result()
+                    parts.append(part)
+                    if stats is not None:
+                        stats.records += part_stats.records
+                        stats.category_rows += part_stats.category_rows
+                        stats.chunks += part_stats.chunks
+            return cls.concat(parts)
+        return cls.from_chunks(iter_record_chunks(path, chunk_size), separator, stats)
+
+    @classmethod
+    def concat(cls, parts):
+        """按顺序拼接多个成员关系 (工具行首尾相接，分类按首次出现合并)"""
+        codes = {}
+        indptr = [np.zeros(1, dtype=np.int64)]
+        indices = []
+        offset = 0
+        for part in parts:
+            mapping = np.fromiter((codes.setdefault(name, len(codes)) for name in part.categories),
+                                  dtype=np.int32, count=part.n_categories)
+            indices.append(mapping[part.indices])
+            indptr.append(part.indptr[1:] + offset)
+            offset += part.nnz
+        indices = np.concatenate(indices) if indices else np.empty(0, dtype=np.int32)
+        return cls(np.concatenate(indptr), indices, list(codes))
+
+    def save(self, path):
+        """写出到目录: indptr.npy / indices.npy / categories.json"""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'indptr.npy'), self.indptr)
+        np.save(os.path.join(path, 'indices.npy'), self.indices)
+        with open(os.path.join(path, 'categories.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.categories.tolist(), f, ensure_ascii=False)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """读取 save 写出的目录 (默认以内存映射方式打开数组)"""
+        mode = 'r' if mmap else None
+        with open(os.path.join(path, 'categories.json'), encoding='utf-8') as f:
+            categories = json.load(f)
+        return cls(np.load(os.path.join(path, 'indptr.npy'), mmap_mode=mode),
+                   np.load(os.path.join(path, 'indices.npy'), mmap_mode=mode), categories)
+
+    def category_counts(self):
+        """各分类的工具数 (去重后的列和)，首次计算后缓存在对象上"""
+        return pd.Series(self._category_counts(), index=self.categories, name='tools_count')
+
+    def _category_counts(self):
+        if self._counts is None:
+            # 重复计算的结果相同，不需要加锁
+            self._counts = np.bincount(self.indices, minlength=self.n_categories)
+        return self._counts
+
+    def to_scipy(self):
+        """转为 scipy.sparse.csr_matrix (需要 scipy，与本对象共享数组)"""
+        sparse = _require_scipy()
+        data = np.ones(self.nnz, dtype=np.int32)
+        return sparse.csr_matrix((data, self.indices, self.indptr), shape=(self.n_tools, self.n_categories))
+
+    def cooccurrence(self, method='numpy'):
+        """分类两两共享的工具数: (a, b, shared) 三个数组，a < b，按 (a, b) 排序
+
+        method: 'numpy' 按工具枚举分类对计数，'scipy' 稀疏矩阵乘积 AᵀA。
+        两者结果相同，首次计算的结果缓存在对象上。
+        """
+        with self._lock:
+            if self._cooccurrence is None:
+                compute = self._cooccurrence_scipy if method == 'scipy' else self._cooccurrence_numpy
+                self._cooccurrence = compute()
+            return self._cooccurrence
+
+    def _cooccurrence_scipy(self):
+        matrix = self.to_scipy()
+        product = (matrix.T.tocsr() @ matrix).tocoo()
+        upper = product.row < product.col
+        a = product.row[upper].astype(np.int32)
+        b = product.col[upper].astype(np.int32)
+        shared = product.data[upper].astype(np.int64)
+        order = np.lexsort((b, a))
+        return a[order], b[order], shared[order]
+
+    def _cooccurrence_numpy(self):
+        # 分类对编码为 a * n + b (a < b)，按工具的分类数分组向量化枚举
+        n = np.int64(self.n_categories)
+        degree = np.diff(self.indptr)
+        keys, counts = [], []
+        for d in np.unique(degree[degree >= 2]):
+            rows = np.flatnonzero(degree == d)
+            first, second = np.triu_indices(d, 1)
+            step = max(PAIR_BLOCK_SIZE // len(first), 1)
+            for start in range(0, len(rows), step):
+                starts = self.indptr[rows[start:start + step]]
+                members = np.sort(self.indices[starts[:, None] + np.arange(d)], axis=1).astype(np.int64)
+                block_keys, block_counts = np.unique((members[:, first] * n + members[:, second]).ravel(),
+                                                     return_counts=True)
+                keys.append(block_keys)
+                counts.append(block_counts)
+        if not keys:
+            empty = np.empty(0, dtype=np.int32)
+            return empty, empty, np.empty(0, dtype=np.int64)
+        keys = np.concatenate(keys)
+        counts = np.concatenate(counts)
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        boundaries = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        shared = np.add.reduceat(counts[order], boundaries).astype(np.int64)
+        keys = keys[boundaries]
+        return (keys // n).astype(np.int32), (keys % n).astype(np.int32), shared
+
+    def pairs(self, categories=None, min_shared=1, top=None, method='numpy'):
+        """分类对重叠表: category_a/category_b/shared_tools/tools_a/tools_b/jaccard
+
+        categories 限定两侧分类的范围 (如筛选后的分类)；按共享工具数降序，
+        同数按 Jaccard 降序。
+        """
+        a, b, shared = self.cooccurrence(method)
+        keep = shared >= min_shared
+        if categories is not None:
+            allowed = np.zeros(self.n_categories, dtype=bool)
+            codes = self.categories.get_indexer(pd.Index(categories, dtype=object))
+            allowed[codes[codes >= 0]] = True
+            keep &= allowed[a] & allowed[b]
+        a, b, shared = a[keep], b[keep], shared[keep]
+        counts = self._category_counts()
+        tools_a, tools_b = counts[a], counts[b]
+        jaccard = shared / (tools_a + tools_b - shared)
+        order = np.lexsort((-jaccard, -shared))
+        if top is not None:
+            order = order[:top]
+        names = self.categories.to_numpy()
+        return pd.DataFrame({
+            'category_a': names[a[order]],
+            'category_b': names[b[order]],
+            'shared_tools': shared[order],
+            'tools_a': tools_a[order],
+            'tools_b': tools_b[order],
+            'jaccard': jaccard[order],
+        })
+
+    def tools_in(self, categories):
+        """属于任一给定分类的工具行号 (去重、升序)，扫描一遍 indices，不建按列索引"""
+        selected = np.zeros(self.n_categories, dtype=bool)
+        codes = self.categories.get_indexer(pd.Index(categories, dtype=object))
+        selected[codes[codes >= 0]] = True
+        positions = np.flatnonzero(selected[self.indices])
+        rows = np.searchsorted(self.indptr, positions, side='right') - 1
+        # positions 升序，行号已排好序，只需去掉相邻重复
+        return rows[np.r_[True, rows[1:] != rows[:-1]]] if len(rows) else rows
+
+    def group_overlap(self, groups, categories=None):
+        """分类组的去重工具数: 组内各分类工具数之和 (重复计数) 与去重后的工具数
+
+        groups 为 {组名: [分类名]}，categories 限定参与统计的分类。
+        """
+        allowed = None if categories is None else set(categories)
+        counts = self.category_counts()
+        rows = []
+        for name, members in groups.items():
+            members = [c for c in members if c in counts.index and (allowed is None or c in allowed)]
+            total = int(counts[members].sum()) if members else 0
+            distinct = len(self.tools_in(members))
+            rows.append({
+                'group': name,
+                'categories': len(members),
+                'tools_sum': total,
+                'distinct_tools': distinct,
+                'duplicate_share': 1 - distinct / total if total else 0.0,
+            })
+        return pd.DataFrame(rows, columns=['group', 'categories', 'tools_sum', 'distinct_tools',
+                                           'duplicate_share'])
+
+
+def _membership_range(path, byte_range, chunk_size, separator):
+    """进程池任务: 构建一个字节区间的成员关系"""
+    stats = IngestStats()
+    part = ToolMembership.from_chunks(iter_record_chunks(path, chunk_size, byte_range), separator, stats)
+    return part, stats
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+预计算模块 - 离线枚举侧边栏筛选组合，批量计算各视图结果，写入按 (数据版本, 视图, 筛选) 索引的结果库
+
+用法: python precompute.py [--data 数据文件] [--out data/precomputed] [--max-tiers 2] [--max-scenarios 1]
+                           [--popular popular.json]
+"""
+
+import os
+import json
+import time
+import pickle
+import hashlib
+import argparse
+import itertools
+
+import analytics
+from data_processor import AIToolsDataProcessor
+from data_sources import open_data_source
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'precomputed')
+
+
+def filter_key(selection):
+    """规范化筛选条件 → 文件名"""
+    payload = json.dumps(selection, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+
+
+class ResultStore:
+    """视图结果库: <目录>/<数据版本>/<视图>/<筛选哈希>.pkl
+
+    数据版本包含数据源与映射表指纹，数据或映射变化后旧结果自然失效。
+    """
+
+    def __init__(self, directory=DEFAULT_STORE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, version, view, selection):
+        return os.path.join(self.directory, version[:16], view, filter_key(selection) + '.pkl')
+
+    def get(self, version, view, selection):
+        """读取预计算结果，未命中时返回 None"""
+        try:
+            with open(self._path(version, view, selection), 'rb') as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, version, view, selection, result):
+        path = self._path(version, view, selection)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with open(tmp, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def stats(self):
+        """命中/未命中统计"""
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0}
+
+
+def canonical_selection(processor, view, tiers=None, scenarios=None):
+    """视图实际使用的筛选条件 (全局视图忽略筛选)"""
+    if analytics.view_id(view) in analytics.GLOBAL_VIEWS:
+        return None, None
+    return processor.selection_key(tiers, scenarios)
+
+
+def serve_view(store, processor, view, tiers=None, scenarios=None):
+    """视图结果: 优先读取预计算结果，未命中时实时计算"""
+    view = analytics.view_id(view)
+    if store is not None:
+        selection = canonical_selection(processor, view, tiers, scenarios)
+        result = store.get(processor.version(), view, selection)
+        if result is not None:
+            return result
+    return analytics.compute_view(processor, view, tiers, scenarios)
+
+
+def filter_combinations(processor, max_tiers=2, max_scenarios=1, popular=None):
+    """枚举筛选组合: 常用组合 + 每个维度「全选或不超过 k 个取值」的笛卡尔积"""
+    df = processor.get_data(analytics.FILTER_COLUMNS)
+    tiers = sorted(map(str, df['market_tier'].unique()))
+    scenarios = sorted(map(str, df['user_scenario'].unique()))
+
+    def subsets(values, k):
+        yield None
+        for size in range(1, min(k, len(values) - 1) + 1):
+            for combo in itertools.combinations(values, size):
+                yield list(combo)
+
+    candidates = list(popular or [])
+    candidates += itertools.product(subsets(tiers, max_tiers), subsets(scenarios, max_scenarios))
+    combinations, seen = [], set()
+    for selected_tiers, selected_scenarios in candidates:
+        key = processor.selection_key(selected_tiers, selected_scenarios)
+        if key not in seen:
+            seen.add(key)
+            combinations.append(key)
+    return combinations
+
+
+def precompute(processor, store, combinations, views=None):
+    """计算并写入各视图在每个筛选组合下的结果，返回 (写入条数, 耗时秒)"""
+    version = processor.version()
+    written = 0
+    start = time.perf_counter()
+    for view in (views or list(analytics.VIEWS)):
+        selections = [(None, None)] if view in analytics.GLOBAL_VIEWS else combinations
+        for tiers, scenarios in selections:
+            result = analytics.compute_view(processor, view, tiers, scenarios)
+            store.put(version, view, (tiers, scenarios), result)
+            written += 1
+    return written, time.perf_counter() - start
+
+
+def _load_popular(path):
+    """常用组合文件: [{"tiers": [...], "scenarios": [...]}, ...]，缺省键表示全选"""
+    with open(path, encoding='utf-8') as f:
+        return [(item.get('tiers'), item.get('scenarios')) for item in json.load(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--data', default=None, help='数据文件 (默认内置数据)')
+    parser.add_argument('--out', default=DEFAULT_STORE_DIR)
+    parser.add_argument('--max-tiers', type=int, default=2)
+    parser.add_argument('--max-scenarios', type=int, default=1)
+    parser.add_argument('--popular', default=None, help='常用筛选组合 JSON')
+    args = parser.parse_args()
+
+    processor = AIToolsDataProcessor(open_data_source(args.data))
+    popular = _load_popular(args.popular) if args.popular else None
+    combinations = filter_combinations(processor, args.max_tiers, args.max_scenarios, popular)
+    written, seconds = precompute(processor, ResultStore(args.out), combinations)
+    print(f"{len(combinations)} 个筛选组合, 写入 {written} 条结果, 耗时 {seconds:.1f}s, "
+          f"数据版本 {processor.version()[:16]}")
+
+
+if __name__ == '__main__':
+    main()
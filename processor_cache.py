@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+处理器缓存模块 - 按数据内容与映射表哈希复用 AIToolsDataProcessor
+
+部署时可预先写出列式快照，仪表盘进程冷启动直接内存映射打开:
+python processor_cache.py [--data 数据文件] [--bundle-dir 快照目录]
+"""
+
+import os
+import re
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from data_processor import AIToolsDataProcessor, mapping_fingerprint
+from data_sources import open_data_source
+from frame_bundle import MANIFEST_NAME
+
+DEFAULT_BUNDLE_DIR = os.path.join(tempfile.gettempdir(), 'ai-tools-bundles')
+# 快照目录中保留的快照数 (按最近使用时间)，更早的在写出新快照后删除
+BUNDLE_KEEP = 4
+_BUNDLE_NAME = re.compile(r'^[0-9a-f]{32}$')
+
+
+class ProcessorCache:
+    """进程级处理器缓存
+
+    缓存键为「数据源内容指纹 + 映射表指纹」，只有数据或映射表变化时才会
+    重新构建处理器。同一进程内的所有会话共享同一实例，线程安全。
+
+    设置 bundle_dir 时，构建结果按缓存键写成列式快照 (frame_bundle)，
+    其他进程未命中时直接以内存映射方式打开，不再各自重建。每次写出新快照后
+    只保留最近使用的 bundle_keep 个，数据或映射表变化留下的旧快照会被删除
+    (已内存映射打开的进程不受影响)。
+
+    构建在全局锁之外进行: 同一键的并发请求等待同一个构建结果 (计为 waits，
+    不计入命中)，其他键的命中不受正在进行的构建影响。clear() 之后才完成的
+    构建只返回给等待者，不写回缓存。
+    """
+
+    def __init__(self, maxsize=4, bundle_dir=None, bundle_keep=BUNDLE_KEEP):
+        self.maxsize = maxsize
+        self.bundle_dir = bundle_dir
+        self.bundle_keep = bundle_keep
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(source):
+        """计算数据源对应的缓存键"""
+        h = hashlib.sha256()
+        h.update(source.fingerprint().encode())
+        h.update(mapping_fingerprint().encode())
+        return h.hexdigest()
+
+    def get(self, source=None):
+        """获取 (或构建) 数据源对应的处理器"""
+        if source is None:
+            source = open_data_source()
+        key = self.cache_key(source)
+        with self._lock:
+            processor = self._entries.get(key)
+            if processor is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return processor
+            future = self._pending.get(key)
+            building = future is None
+            if building:
+                self.misses += 1
+                future = self._pending[key] = Future()
+                generation = self._generation
+            else:
+                self.waits += 1
+        if not building:
+            return future.result()
+        try:
+            processor = self._build(key, source)
+        except BaseException as exc:
+            with self._lock:
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            if generation == self._generation:
+                self._entries[key] = processor
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        future.set_result(processor)
+        return processor
+
+    def _build(self, key, source):
+        """构建处理器；有列式快照时直接内存映射打开"""
+        if self.bundle_dir is None:
+            return AIToolsDataProcessor(source)
+        # 写出快照的进程同样从快照打开，保证所有进程的数据布局一致
+        return AIToolsDataProcessor.load(self._ensure_bundle(key, source))
+
+    def _ensure_bundle(self, key, source):
+        path = os.path.join(self.bundle_dir, key[:32])
+        manifest = os.path.join(path, MANIFEST_NAME)
+        if os.path.exists(manifest):
+            # 更新使用时间，清理时按最近使用保留
+            os.utime(manifest)
+            return path
+        os.makedirs(self.bundle_dir, exist_ok=True)
+        AIToolsDataProcessor(source).save(path)
+        self._prune_bundles(keep=path)
+        return path
+
+    def _prune_bundles(self, keep):
+        """删除最近使用的 bundle_keep 个以外的旧快照 (keep 为刚写出的快照)"""
+        bundles = []
+        for name in os.listdir(self.bundle_dir):
+            path = os.path.join(self.bundle_dir, name)
+            if path == keep or not _BUNDLE_NAME.match(name):
+                continue
+            try:
+                bundles.append((os.path.getmtime(os.path.join(path, MANIFEST_NAME)), path))
+            except OSError:
+                continue
+        bundles.sort(reverse=True)
+        for _, path in bundles[max(self.bundle_keep - 1, 0):]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def warm(self, source=None):
+        """预先写出数据源对应的列式快照 (已存在时跳过)，返回快照路径"""
+        if self.bundle_dir is None:
+            raise ValueError("未设置 bundle_dir，无法写出列式快照")
+        if source is None:
+            source = open_data_source()
+        return self._ensure_bundle(self.cache_key(source), source)
+
+    def stats(self):
+        """命中/未命中/等待进行中构建的统计"""
+        total = self.hits + self.misses + self.waits
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'waits': self.waits,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._entries),
+        }
+
+    def clear(self):
+        """清空缓存与统计，进行中的构建完成后不再写回缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self._generation += 1
+            self.hits = 0
+            self.misses = 0
+            self.waits = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default=None, help='数据文件 (默认内置数据)')
+    parser.add_argument('--bundle-dir', default=os.environ.get('AI_TOOLS_BUNDLE_DIR') or DEFAULT_BUNDLE_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = ProcessorCache(bundle_dir=args.bundle_dir).warm(open_data_source(args.data))
+    print(f"列式快照: {path} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+重跑耗时分析模块 - 记录每次 Streamlit 重跑中视图、标签页、图表等片段的耗时
+
+每个会话一个 RerunProfiler，最近 capacity 次重跑保存在环形缓冲中，按视图/片段
+统计 p50/p95/p99。本模块不依赖 Streamlit，会话状态由 app.py 管理。
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CAPACITY = 200
+PERCENTILES = [50, 95, 99]
+
+
+class RerunProfiler:
+    """单个会话的重跑耗时记录 (环形缓冲)
+
+    用法: begin() → span()/segment() 记录片段 → end(view) 结束本次重跑。
+    span 为上下文管理器；segment 为顺序片段，同类的下一个 segment 开始或
+    close()/end() 时结束 (适合 if/elif 视图分支与依次渲染的标签页)。
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, dump_path=None):
+        self.reruns = deque(maxlen=capacity)
+        self.dump_path = dump_path
+        self._current = None
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def begin(self):
+        """开始记录一次重跑 (上一次未结束的记录被丢弃)"""
+        self._current = {'started_at': time.time(), 'view': None, 'seconds': None, 'spans': []}
+        self._open = {}
+        self._start = time.perf_counter()
+
+    def _record(self, kind, name, seconds):
+        if self._current is not None:
+            self._current['spans'].append({'kind': kind, 'name': name, 'seconds': seconds})
+
+    @contextmanager
+    def span(self, kind, name):
+        """记录一个片段: `with profiler.span('chart', 'tab1/pareto_curve'):`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(kind, name, time.perf_counter() - start)
+
+    def segment(self, kind, name):
+        """开始 kind 类的新顺序片段，同时结束该类上一个片段"""
+        self.close(kind)
+        self._open[kind] = (name, time.perf_counter())
+
+    def close(self, kind):
+        """结束 kind 类当前的顺序片段"""
+        opened = self._open.pop(kind, None)
+        if opened is not None:
+            name, start = opened
+            self._record(kind, name, time.perf_counter() - start)
+
+    def end(self, view):
+        """结束本次重跑，写入环形缓冲 (设置了 dump_path 时追加到 JSON Lines 文件)"""
+        if self._current is None:
+            return None
+        for kind in list(self._open):
+            self.close(kind)
+        rerun = self._current
+        rerun['view'] = view
+        rerun['seconds'] = time.perf_counter() - self._start
+        self._current = None
+        with self._lock:
+            self.reruns.append(rerun)
+        if self.dump_path:
+            self.dump(self.dump_path, [rerun])
+        return rerun
+
+    def spans(self):
+        """最近各次重跑的片段明细 (DataFrame，含整次重跑的 rerun 记录)"""
+        with self._lock:
+            reruns = list(self.reruns)
+        rows = []
+        for i, rerun in enumerate(reruns):
+            rows.append({'rerun': i, 'view': rerun['view'], 'kind': 'rerun', 'name': rerun['view'],
+                         'seconds': rerun['seconds']})
+            rows.extend({'rerun': i, 'view': rerun['view'], **span} for span in rerun['spans'])
+        return pd.DataFrame(rows, columns=['rerun', 'view', 'kind', 'name', 'seconds'])
+
+    def percentiles(self, by=('view',), kinds=('rerun',)):
+        """按 by 分组的耗时分位数 (毫秒)
+
+        默认统计每个视图整次重跑的 p50/p95/p99；by=('view', 'kind', 'name')
+        且 kinds=None 时统计每个片段。
+        """
+        columns = list(by) + ['count'] + [f'p{q}_ms' for q in PERCENTILES]
+        spans = self.spans()
+        if kinds is not None:
+            spans = spans[spans['kind'].isin(kinds)]
+        if spans.empty:
+            return pd.DataFrame(columns=columns)
+        rows = []
+        for key, group in spans.groupby(list(by), sort=False):
+            key = key if isinstance(key, tuple) else (key,)
+            values = np.percentile(group['seconds'].to_numpy() * 1000, PERCENTILES)
+            rows.append(list(key) + [len(group)] + list(values))
+        return pd.DataFrame(rows, columns=columns).sort_values(columns[-2], ascending=False, ignore_index=True)
+
+    def dump(self, path, reruns=None):
+        """以 JSON Lines 追加写出重跑记录 (默认为缓冲中的全部记录)，返回写出条数"""
+        if reruns is None:
+            with self._lock:
+                reruns = list(self.reruns)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            for rerun in reruns:
+                f.write(json.dumps(rerun, ensure_ascii=False) + '\n')
+        return len(reruns)
+
+
+def load_dump(path):
+    """读取 dump 写出的 JSON Lines 文件 (离线分析用)，返回包含全部记录的 RerunProfiler"""
+    profiler = RerunProfiler(capacity=None)
+    with open(path, encoding='utf-8') as f:
+        profiler.reruns.extend(json.loads(line) for line in f if line.strip())
+    return profiler
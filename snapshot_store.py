@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+快照存储模块 - 按 (日期, 分类) 追加保存每日抓取的工具数，tools_count 以增量编码
+"""
+
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from data_sources import DataSource
+
+# 每隔多少个快照保存一份完整计数 (关键帧)，限制按日期重建时需要回放的增量数
+CHECKPOINT_INTERVAL = 30
+
+
+class SnapshotStore:
+    """追加式多快照存储
+
+    每个快照只保存相对上一状态发生变化的 (分类编号, 增量) 对，新快照的写入代价
+    为 O(本快照行数)，不需要重新处理历史。快照按 upsert 语义合并: 未出现在
+    新快照中的分类保持上一次的计数。
+
+    directory 不为空时持久化为追加式文件: categories.jsonl (分类编号表，每行
+    记录分类名与首次出现的日期) 与每个日期一个 YYYY-MM-DD.npz (增量)。增量
+    文件先写临时文件再原子替换，写成功后才追加编号表；回放时丢弃写到一半的
+    编号表行以及引用了未登记分类的最后一个增量文件 (写入过程中崩溃的快照)。
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.categories = []
+        self.dates = []
+        self._index = pd.Index([], dtype=object)
+        self._deltas = []
+        self._latest = np.zeros(0, dtype=np.int64)
+        self._first_seen = np.zeros(0, dtype=np.int32)
+        self._checkpoints = {}
+        self._persisted = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._replay()
+
+    def __len__(self):
+        return len(self.dates)
+
+    def append(self, date, snapshot):
+        """追加一天的快照，snapshot 为含 category/tools_count 列的 DataFrame 或 {分类: 数量}"""
+        date = np.datetime64(date, 'D')
+        if self.dates and date <= self.dates[-1]:
+            raise ValueError(f"快照日期必须晚于最后一个快照 {self.dates[-1]}: {date}")
+        if isinstance(snapshot, dict):
+            snapshot = pd.DataFrame({'category': list(snapshot), 'tools_count': list(snapshot.values())})
+        categories = snapshot['category'].to_numpy(dtype=object)
+        counts = snapshot['tools_count'].to_numpy(dtype=np.int64)
+        if not pd.Index(categories).is_unique:
+            raise ValueError(f"快照 {date} 中存在重复的分类")
+
+        self._intern(categories)
+        ids = self._index.get_indexer(categories)
+        delta = counts - self._latest[ids]
+        changed = delta != 0
+        ids, delta = ids[changed].astype(np.int32), delta[changed]
+        if len(delta) and np.abs(delta).max() < np.iinfo(np.int32).max:
+            delta = delta.astype(np.int32)
+
+        if self.directory is not None:
+            self._persist(date, ids, delta)
+        self._record(date, ids, delta)
+
+    def _record(self, date, ids, delta):
+        self.dates.append(date)
+        self._deltas.append((ids, delta))
+        self._latest[ids] += delta
+        if len(self.dates) % CHECKPOINT_INTERVAL == 0:
+            self._checkpoints[len(self.dates) - 1] = self._latest.copy()
+
+    def _intern(self, categories):
+        """为新出现的分类分配编号，返回新分类名列表"""
+        known = self._index.get_indexer(categories) if len(self._index) else np.full(len(categories), -1)
+        new_names = list(pd.unique(categories[known < 0])) if (known < 0).any() else []
+        if new_names:
+            self.categories.extend(new_names)
+            self._index = pd.Index(self.categories, dtype=object)
+            self._latest = np.concatenate([self._latest, np.zeros(len(new_names), dtype=np.int64)])
+            self._first_seen = np.concatenate([
+                self._first_seen, np.full(len(new_names), len(self.dates), dtype=np.int32)
+            ])
+        return new_names
+
+    def _position(self, date):
+        """不晚于 date 的最后一个快照位置，没有时为 -1"""
+        if date is None:
+            return len(self.dates) - 1
+        return int(np.searchsorted(np.asarray(self.dates), np.datetime64(date, 'D'), side='right')) - 1
+
+    def counts_at(self, date=None):
+        """截至 date (含) 的各分类计数 (按分类编号的稠密向量)"""
+        position = self._position(date)
+        if position == len(self.dates) - 1:
+            return self._latest.copy()
+        counts = np.zeros(len(self.categories), dtype=np.int64)
+        start = 0
+        keyframes = [p for p in self._checkpoints if p <= position]
+        if keyframes:
+            base = max(keyframes)
+            counts[:len(self._checkpoints[base])] = self._checkpoints[base]
+            start = base + 1
+        for ids, delta in self._deltas[start:position + 1]:
+            np.add.at(counts, ids, delta)
+        return counts
+
+    def snapshot(self, date=None):
+        """截至 date 的快照 DataFrame (category, tools_count)，按工具数降序"""
+        position = self._position(date)
+        counts = self.counts_at(date)
+        seen = self._first_seen <= position
+        df = pd.DataFrame({
+            'category': np.asarray(self.categories, dtype=object)[seen],
+            'tools_count': counts[seen],
+        })
+        return df.sort_values('tools_count', ascending=False, kind='stable').reset_index(drop=True)
+
+    def growth(self, start, end=None):
+        """start (不含) 到 end (含) 之间各分类的增长
+
+        只累加区间内快照的增量，代价与区间内的变化条数成正比。两个端点都取
+        不晚于该日期的最后一个快照，实际比较的快照日期记在结果的
+        attrs['start_date'] / attrs['end_date'] 中 (start 早于第一个快照时
+        start_date 为 None，起点计数按 0 计)。
+        """
+        begin, finish = self._position(start), self._position(end)
+        start_counts = self.counts_at(start) if begin >= 0 else np.zeros(len(self.categories), dtype=np.int64)
+        change = np.zeros(len(self.categories), dtype=np.int64)
+        for ids, delta in self._deltas[begin + 1:finish + 1]:
+            np.add.at(change, ids, delta)
+        seen = self._first_seen <= finish
+        df = pd.DataFrame({
+            'category': np.asarray(self.categories, dtype=object)[seen],
+            'start_count': start_counts[seen],
+            'end_count': (start_counts + change)[seen],
+            'growth': change[seen],
+        })
+        df['growth_pct'] = df['growth'] / df['start_count'].where(df['start_count'] > 0) * 100
+        df = df.sort_values('growth', ascending=False, kind='stable').reset_index(drop=True)
+        df.attrs['start_date'] = self.dates[begin] if begin >= 0 else None
+        df.attrs['end_date'] = self.dates[finish] if finish >= 0 else None
+        return df
+
+    def growth_last(self, days=90, end=None):
+        """最近 days 天的增长 (例如最近 90 天)
+
+        end - days 当天没有快照时以其之前的最后一个快照为起点，实际区间会比
+        days 天更长；实际起止日期见结果的 attrs['start_date'] / attrs['end_date']。
+        """
+        end = self.dates[-1] if end is None else np.datetime64(end, 'D')
+        return self.growth(end - np.timedelta64(days, 'D'), end)
+
+    def history(self, category):
+        """单个分类的时间序列"""
+        position = self._index.get_indexer([category])[0]
+        if position < 0:
+            raise KeyError(category)
+        values = np.zeros(len(self.dates), dtype=np.int64)
+        for i, (ids, delta) in enumerate(self._deltas):
+            hit = np.flatnonzero(ids == position)
+            if len(hit):
+                values[i] = delta[hit[0]]
+        return pd.Series(np.cumsum(values), index=pd.DatetimeIndex(self.dates), name=category)
+
+    def _persist(self, date, ids, delta):
+        path = os.path.join(self.directory, f'{date}.npz')
+        partial = path + '.tmp'
+        with open(partial, 'wb') as f:
+            np.savez(f, ids=ids, delta=delta)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, path)
+        # 尚未写入编号表的分类 (包括之前写入失败的快照中出现的) 首次出现于本快照
+        pending = self.categories[self._persisted:]
+        if pending:
+            with open(os.path.join(self.directory, 'categories.jsonl'), 'a', encoding='utf-8') as f:
+                for name in pending:
+                    f.write(json.dumps({'name': name, 'date': str(date)}, ensure_ascii=False) + '\n')
+            self._persisted = len(self.categories)
+
+    def _replay(self):
+        """从目录回放已有快照"""
+        path = os.path.join(self.directory, 'categories.jsonl')
+        if not os.path.exists(path):
+            return
+        entries = self._read_categories(path)
+        # 旧版编号表每行只有分类名，首次出现位置由第一个非零增量推断
+        names = [e['name'] if isinstance(e, dict) else e for e in entries]
+        first_dates = [e.get('date') if isinstance(e, dict) else None for e in entries]
+        self.categories = names
+        self._persisted = len(names)
+        self._index = pd.Index(names, dtype=object)
+        self._latest = np.zeros(len(names), dtype=np.int64)
+        self._first_seen = np.full(len(names), np.iinfo(np.int32).max, dtype=np.int32)
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz.tmp'):
+                os.remove(os.path.join(self.directory, name))
+        files = sorted(f for f in os.listdir(self.directory) if f.endswith('.npz'))
+        for i, name in enumerate(files):
+            with np.load(os.path.join(self.directory, name)) as data:
+                ids, delta = data['ids'], data['delta']
+            if len(ids) and ids.max() >= len(names):
+                if i != len(files) - 1:
+                    raise ValueError(f"快照 {name} 引用了编号表中不存在的分类")
+                # 增量已写出但编号表未追加: 该快照未完成，丢弃
+                os.remove(os.path.join(self.directory, name))
+                break
+            first = self._first_seen[ids] > len(self.dates)
+            self._first_seen[ids[first]] = len(self.dates)
+            self._record(np.datetime64(name[:-4], 'D'), ids, delta)
+        # 以计数 0 首次出现的分类没有增量，按编号表中记录的日期恢复
+        known = np.array([d is not None for d in first_dates], dtype=bool)
+        if known.any():
+            recorded = np.array([d for d in first_dates if d is not None], dtype='datetime64[D]')
+            self._first_seen[known] = np.searchsorted(np.asarray(self.dates, dtype='datetime64[D]'), recorded)
+
+    @staticmethod
+    def _read_categories(path):
+        """读取编号表；最后一行写到一半 (没有换行或无法解析) 时丢弃并截断文件"""
+        with open(path, 'rb') as f:
+            content = f.read()
+        end = content.rfind(b'\n') + 1
+        lines = content[:end].decode('utf-8').splitlines()
+        entries = [json.loads(line) for line in lines if line.strip()]
+        if end < len(content):
+            with open(path, 'r+b') as f:
+                f.truncate(end)
+        return entries
+
+
+class SnapshotSource(DataSource):
+    """以快照存储中某一天的数据作为 AIToolsDataProcessor 的数据源"""
+
+    def __init__(self, store, date=None, columns=None, filters=None):
+        super().__init__(columns, filters)
+        self.store = store
+        self.date = date
+
+    def _content_fingerprint(self):
+        # 追加式存储中某个已存在快照的内容不会再变化
+        position = self.store._position(self.date)
+        resolved = str(self.store.dates[position]) if position >= 0 else ''
+        return f"{self.store.directory or id(self.store)}:{resolved}:{len(self.store.categories)}"
+
+    def _read(self, columns):
+        df = self.store.snapshot(self.date)
+        return df[[c for c in columns if c in df.columns]]
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+分类体系模块 - 将声明式分类映射 (data/taxonomy.json) 编译为单一查找索引
+"""
+
+import os
+import json
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'data', 'taxonomy.json'
+)
+
+
+class Taxonomy:
+    """编译后的分类体系
+
+    `matrix[i, j]` 为第 i 个已登记分类在第 j 个维度上的标签编码，最后一行
+    对应未登记分类 (各维度的默认标签)。所有维度通过一次行 gather 同时得到，
+    不再对每个维度单独做一次 Series.map。
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        dimensions = spec.get('dimensions', {})
+        flags = spec.get('flags', {})
+        self.columns = list(dimensions) + list(flags)
+        self.flag_columns = list(flags)
+
+        # 各维度标签表 (标志维度为 False/True)
+        self.labels = {}
+        members = {}
+        for name, dim in dimensions.items():
+            labels = list(dim['labels'])
+            if dim['default'] not in labels:
+                labels.append(dim['default'])
+            self.labels[name] = labels
+            members[name] = [(labels.index(label), cats) for label, cats in dim['labels'].items()]
+        for name, flag in flags.items():
+            self.labels[name] = [False, True]
+            members[name] = [(1, flag['categories'])]
+
+        ordered = {}
+        for groups in members.values():
+            for _, cats in groups:
+                ordered.update(dict.fromkeys(cats))
+        self.categories = pd.Index(list(ordered))
+
+        n = len(self.categories)
+        widest = max((len(labels) for labels in self.labels.values()), default=0)
+        dtype = np.int8 if widest < 128 else np.int16
+        self.matrix = np.empty((n + 1, len(self.columns)), dtype=dtype)
+        for j, name in enumerate(self.columns):
+            default = dimensions[name]['default'] if name in dimensions else False
+            column = np.full(n + 1, self.labels[name].index(default), dtype=dtype)
+            seen = np.zeros(n + 1, dtype=bool)
+            for code, cats in members[name]:
+                positions = self.categories.get_indexer(cats)
+                if seen[positions].any() or len(set(cats)) != len(cats):
+                    raise ValueError(f"分类体系维度 {name} 中存在重复登记的分类")
+                seen[positions] = True
+                column[positions] = code
+            self.matrix[:, j] = column
+
+        self._label_arrays = {
+            name: np.asarray(labels, dtype=object) for name, labels in self.labels.items()
+        }
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def fingerprint(self):
+        """分类体系内容指纹"""
+        payload = json.dumps(self.spec, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def lookup(self, categories):
+        """分类 → 标签编码矩阵 (n_rows, n_columns)，一次 gather"""
+        categories = pd.Series(categories)
+        if isinstance(categories.dtype, pd.CategoricalDtype):
+            # 分类型列只需对去重后的类别做一次哈希查找
+            positions = self.categories.get_indexer(categories.cat.categories)
+            positions = np.append(positions, -1)[categories.cat.codes.to_numpy()]
+        else:
+            positions = self.categories.get_indexer(categories)
+        positions[positions < 0] = len(self.categories)
+        return self.matrix[positions]
+
+    def labels_for(self, codes, name):
+        """从 lookup 得到的编码矩阵中取出某一维度的标签，标志维度为布尔数组"""
+        column = codes[:, self.columns.index(name)]
+        if name in self.flag_columns:
+            return column.astype(bool)
+        return self._label_arrays[name][column]
+
+    def assign(self, categories):
+        """返回 {列名: 标签数组}"""
+        codes = self.lookup(categories)
+        return {name: self.labels_for(codes, name) for name in self.columns}
+
+
+def load_taxonomy(path=None):
+    """加载并编译分类体系 (按文件修改时间缓存)"""
+    path = path or DEFAULT_TAXONOMY_PATH
+    return _load_taxonomy(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_taxonomy(path, mtime_ns):
+    return Taxonomy.from_file(path)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+工具数增量更新 (apply_count_deltas) 与全量重算的随机等价性测试
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import AIToolsDataProcessor  # noqa: E402
+from data_sources import FrameDataSource  # noqa: E402
+
+# 参与比较的数值派生列
+NUMERIC_COLUMNS = list(AIToolsDataProcessor.NUMERIC_DEPENDENCIES)
+BASE_COLUMNS = ['rank', 'category', 'tools_count', 'chinese_name']
+ROUNDS = 20
+
+
+def synthetic_frame(n_rows, rng):
+    counts = np.sort(rng.zipf(1.3, n_rows).clip(max=20000) * 5)[::-1]
+    return pd.DataFrame({
+        'rank': np.arange(1, n_rows + 1),
+        'category': [f'cat-{i}' for i in range(n_rows)],
+        'tools_count': counts,
+        'chinese_name': [f'分类{i}' for i in range(n_rows)],
+    })
+
+
+def random_deltas(df, rng, batch):
+    rows = rng.choice(len(df), size=min(batch, len(df)), replace=False)
+    counts = df['tools_count'].to_numpy()[rows]
+    change = np.maximum(rng.integers(-50, 200, size=len(rows)), -counts)
+    return dict(zip(df['category'].to_numpy()[rows], change))
+
+
+def assert_equivalent(processor, compact=False):
+    rebuilt = AIToolsDataProcessor(FrameDataSource(processor.df[BASE_COLUMNS]), compact=compact)
+    expected = rebuilt.get_data(NUMERIC_COLUMNS)
+    actual = processor.get_data(NUMERIC_COLUMNS)
+    for column in ['tools_count'] + NUMERIC_COLUMNS:
+        pd.testing.assert_series_equal(actual[column], expected[column], check_exact=True, check_dtype=False)
+    # 从快照加载的标签列是 Categorical，只比较分组取值，不比较索引类型
+    for dimension in ['market_tier', 'competition_quadrant', 'user_scenario']:
+        pd.testing.assert_frame_equal(processor.dimension_stats(dimension, ['Tier 5 尾部']),
+                                      rebuilt.dimension_stats(dimension, ['Tier 5 尾部']),
+                                      check_index_type=False, check_categorical=False)
+
+
+def run_rounds(processor, rng, compact=False):
+    processor.get_data(NUMERIC_COLUMNS)
+    processor.dimension_stats('user_scenario')
+    for _ in range(ROUNDS):
+        # 每轮 1-2 批增量，覆盖惰性列在两次更新之间未被重新派生的情况
+        for _ in range(rng.integers(1, 3)):
+            processor.apply_count_deltas(random_deltas(processor.df, rng, rng.integers(1, 12)))
+        assert_equivalent(processor, compact)
+
+
+@pytest.mark.parametrize('n_rows, compact', [(150, False), (150, True), (2000, False)])
+def test_random_deltas_match_full_rebuild(n_rows, compact):
+    rng = np.random.default_rng(n_rows + compact)
+    processor = AIToolsDataProcessor(FrameDataSource(synthetic_frame(n_rows, rng)), compact=compact)
+    run_rounds(processor, rng, compact)
+
+
+def test_bundle_loaded_processor(tmp_path):
+    # load() 内存映射只读的列式快照，增量更新不能写入原数组
+    rng = np.random.default_rng(1)
+    AIToolsDataProcessor(FrameDataSource(synthetic_frame(500, rng))).save(str(tmp_path))
+    processor = AIToolsDataProcessor.load(str(tmp_path))
+    held = processor.df
+    original = held['tools_count'].to_numpy().copy()
+    run_rounds(processor, rng)
+    np.testing.assert_array_equal(held['tools_count'].to_numpy(), original)
+    assert processor._prefix[-1] == processor.df['tools_count'].sum()
+
+
+def test_rejected_update_leaves_processor_unchanged():
+    rng = np.random.default_rng(2)
+    processor = AIToolsDataProcessor(FrameDataSource(synthetic_frame(150, rng)))
+    processor.get_data(NUMERIC_COLUMNS)
+    df = processor.df
+    with pytest.raises(KeyError):
+        processor.apply_count_deltas({'cat-0': 1, 'missing': 1})
+    with pytest.raises(ValueError):
+        processor.apply_count_deltas({'cat-0': -10 ** 9})
+    assert processor.df is df
+    assert_equivalent(processor)
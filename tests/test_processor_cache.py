@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+处理器缓存测试: 列式快照清理、并发构建的统计与 clear()
+"""
+
+import os
+import sys
+import time
+import threading
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_sources import FrameDataSource  # noqa: E402
+from processor_cache import ProcessorCache  # noqa: E402
+
+
+def frame_source(scale):
+    return FrameDataSource(pd.DataFrame({
+        'rank': [1, 2, 3],
+        'category': ['Chatbot', 'Image', 'Video'],
+        'tools_count': [30 * scale, 20 * scale, 10 * scale],
+        'chinese_name': ['聊天', '图像', '视频'],
+    }))
+
+
+def test_old_bundles_are_pruned(tmp_path):
+    cache = ProcessorCache(bundle_dir=str(tmp_path), bundle_keep=2)
+    paths = [cache.warm(frame_source(scale)) for scale in range(1, 5)]
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in paths[-2:])
+    # 重新使用的快照按最近使用保留
+    cache.warm(frame_source(3))
+    cache.warm(frame_source(5))
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in [paths[2], cache.warm(frame_source(5))])
+    assert cache.get(frame_source(5)).df['tools_count'].tolist() == [150, 100, 50]
+
+
+class SlowCache(ProcessorCache):
+    """构建在 release 被设置前阻塞，用于模拟进行中的构建"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _build(self, key, source):
+        self.started.set()
+        self.release.wait(5)
+        return super()._build(key, source)
+
+
+def start_get(cache, source):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(cache.get(source)))
+    thread.start()
+    return thread, results
+
+
+def test_waiters_are_not_counted_as_hits():
+    cache = SlowCache()
+    builder, built = start_get(cache, frame_source(1))
+    cache.started.wait(5)
+    waiter, waited = start_get(cache, frame_source(1))
+    while cache.waits == 0:
+        time.sleep(0.001)
+    cache.release.set()
+    builder.join()
+    waiter.join()
+    assert waited[0] is built[0]
+    cache.get(frame_source(1))
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'waits': 1, 'hit_rate': 1 / 3, 'size': 1}
+
+
+def test_build_finishing_after_clear_is_not_stored():
+    cache = SlowCache()
+    builder, built = start_get(cache, frame_source(1))
+    cache.started.wait(5)
+    cache.clear()
+    cache.release.set()
+    builder.join()
+    assert built[0] is not None
+    assert cache.stats()['size'] == 0
+    assert cache.get(frame_source(1)) is not built[0]
+    assert cache.stats()['misses'] == 1
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+快照存储的持久化与回放测试 (含写入过程中崩溃留下的文件)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot_store import SnapshotStore  # noqa: E402
+
+SNAPSHOTS = [
+    ('2025-01-01', {'Chatbot': 10, 'Image': 5}),
+    ('2025-01-02', {'Chatbot': 12, 'Video': 0}),
+    ('2025-01-05', {'Image': 7, 'Audio': 3}),
+]
+
+
+def filled(directory):
+    store = SnapshotStore(directory)
+    for date, snapshot in SNAPSHOTS:
+        store.append(date, snapshot)
+    return store
+
+
+def assert_same(actual, expected):
+    assert [str(d) for d in actual.dates] == [str(d) for d in expected.dates]
+    assert actual.categories == expected.categories
+    for date in expected.dates:
+        pd.testing.assert_frame_equal(actual.snapshot(date), expected.snapshot(date))
+
+
+def test_reopen_replays_all_snapshots(tmp_path):
+    store = filled(tmp_path)
+    reopened = SnapshotStore(tmp_path)
+    assert_same(reopened, store)
+    # 以计数 0 首次出现的分类在重新打开后仍然可见
+    assert 'Video' in set(reopened.snapshot('2025-01-02')['category'])
+
+
+def test_crash_after_array_write_drops_unfinished_snapshot(tmp_path):
+    filled(tmp_path)
+    # 模拟: 增量文件已写出，追加编号表之前崩溃
+    np.savez(tmp_path / '2025-01-06.npz', ids=np.array([4], dtype=np.int32), delta=np.array([1], dtype=np.int32))
+    reopened = SnapshotStore(tmp_path)
+    assert len(reopened) == len(SNAPSHOTS)
+    assert not (tmp_path / '2025-01-06.npz').exists()
+    reopened.append('2025-01-06', {'Music': 2})
+    assert_same(SnapshotStore(tmp_path), reopened)
+
+
+def test_truncated_category_line_and_temp_file_are_discarded(tmp_path):
+    store = filled(tmp_path)
+    with open(tmp_path / 'categories.jsonl', 'a', encoding='utf-8') as f:
+        f.write('{"name": "Mus')
+    (tmp_path / '2025-01-06.npz.tmp').write_bytes(b'partial')
+    reopened = SnapshotStore(tmp_path)
+    assert_same(reopened, store)
+    assert not (tmp_path / '2025-01-06.npz.tmp').exists()
+    reopened.append('2025-01-06', {'Music': 2})
+    assert_same(SnapshotStore(tmp_path), reopened)
+
+
+def test_failed_write_keeps_store_consistent(tmp_path, monkeypatch):
+    store = filled(tmp_path)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        store.append('2025-01-06', {'Music': 2})
+    monkeypatch.undo()
+    assert len(store) == len(SNAPSHOTS)
+    store.append('2025-01-07', {'Music': 4})
+    assert_same(SnapshotStore(tmp_path), store)
+
+
+def test_growth_last_reports_actual_window():
+    store = SnapshotStore()
+    for date, snapshot in SNAPSHOTS:
+        store.append(date, snapshot)
+    # 2025-01-05 往前 2 天为 01-03，没有快照，起点退到 01-02
+    growth = store.growth_last(2)
+    assert growth.attrs['start_date'] == np.datetime64('2025-01-02')
+    assert growth.attrs['end_date'] == np.datetime64('2025-01-05')
+    assert dict(zip(growth['category'], growth['growth'])) == {
+        'Chatbot': 0, 'Image': 2, 'Video': 0, 'Audio': 3,
+    }
+    # 起点早于第一个快照时从 0 开始计
+    assert store.growth_last(30).attrs['start_date'] is None
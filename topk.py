@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Top-K 模块 - 基于预排序行索引的前 k 行查询 (不复制整表、不重复全量排序)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class TopKIndex:
+    """每个 (排序键, 方向) 组合缓存一次稳定排序后的行位置 (行不变时有效)
+
+    首次查询 O(n log n) 排序，之后无筛选时 O(k)；有筛选掩码时按块扫描
+    预排序位置直到凑满 k 行。稳定排序保证并列时保持原行顺序，与
+    nsmallest/nlargest(keep='first') 一致。
+    """
+
+    def __init__(self):
+        self._orders = {}
+
+    def order(self, df, by, ascending=True):
+        """按排序键返回排序后的行位置"""
+        keys = [by] if isinstance(by, str) else list(by)
+        directions = [ascending] * len(keys) if isinstance(ascending, bool) else list(ascending)
+        cache_key = (tuple(keys), tuple(directions))
+        order = self._orders.get(cache_key)
+        if order is None:
+            columns = []
+            for key, asc in zip(keys, directions):
+                values = df[key].to_numpy()
+                if not np.issubdtype(values.dtype, np.number):
+                    values = pd.factorize(df[key], sort=True)[0]
+                columns.append(values if asc else -values.astype(np.float64))
+            # np.lexsort 以最后一个键为主键，且是稳定排序
+            order = np.lexsort(columns[::-1])
+            self._orders[cache_key] = order
+        return order
+
+    def top_k(self, df, k, by='tools_count', ascending=False, mask=None):
+        """前 k 行的位置；mask 为布尔行掩码 (None 表示全部行)"""
+        order = self.order(df, by, ascending)
+        if mask is None:
+            return order[:k]
+        picked = []
+        found = 0
+        start = 0
+        chunk = max(4 * k, 256)
+        while found < k and start < len(order):
+            block = order[start:start + chunk]
+            block = block[mask[block]]
+            picked.append(block)
+            found += len(block)
+            start += chunk
+            chunk *= 2
+        if not picked:
+            return order[:0]
+        return np.concatenate(picked)[:k]